@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# asset_pipeline.py — minify, fingerprint and precompress the generated site
+
+import os, re, gzip, hashlib
+from typing import Dict, Tuple
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+ASSETS_SUBDIR = "assets"
+HASH_LEN = 10
+MIN_COMPRESS_BYTES = 256  # below this the .gz/.br variant isn't worth a round-trip
+
+CACHE_HTML = "public, max-age=0, must-revalidate"
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".json": "application/json; charset=utf-8",
+}
+COMPRESSIBLE = tuple(CONTENT_TYPES)
+
+# name.0123abcdef.css / .js (+ .gz / .br) — anything else in assets/ is left alone
+FINGERPRINTED_RE = re.compile(r"^.+\.[0-9a-f]{%d}\.(css|js|json)(\.gz|\.br)?$" % HASH_LEN)
+
+STYLE_RE = re.compile(r"<style>(.*?)</style>", re.S)
+INLINE_SCRIPT_RE = re.compile(r"<script>(.*?)</script>", re.S)
+HTML_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.S)
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+
+
+# =================================================
+# MINIFY (conservative — whitespace/comments only)
+# =================================================
+def minify_css(css: str) -> str:
+    css = CSS_COMMENT_RE.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def minify_js(js: str) -> str:
+    # line-preserving: trim indentation and blank lines, keep newlines for ASI
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def minify_html(page: str) -> str:
+    page = HTML_COMMENT_RE.sub("", page)
+    # a whitespace run renders as one space, so collapsing keeps layout identical
+    page = re.sub(r"[ \t]*\n\s*", "\n", page)
+    page = re.sub(r"[ \t]{2,}", " ", page)
+    return page.strip() + "\n"
+
+
+# =================================================
+# FINGERPRINT
+# =================================================
+def fingerprint(name: str, data: bytes) -> str:
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LEN]
+    return f"{ASSETS_SUBDIR}/{stem}.{digest}{ext}"
+
+
+def extract_assets(page: str) -> Tuple[str, Dict[str, bytes]]:
+    """
+    Pull inline <style> and <script> blocks out of the page into
+    content-hashed files and link them back in.
+    Returns (rewritten page, {relative path: bytes}).
+    """
+    files: Dict[str, bytes] = {}
+
+    css = "\n".join(STYLE_RE.findall(page))
+    if css:
+        data = minify_css(css).encode("utf-8")
+        css_path = fingerprint("styles.css", data)
+        files[css_path] = data
+        page = STYLE_RE.sub("", page)
+        page = page.replace("</head>", f'<link rel="stylesheet" href="{css_path}">\n</head>', 1)
+
+    # inline scripts → one deferred bundle; deferred scripts still run before DOMContentLoaded
+    scripts = INLINE_SCRIPT_RE.findall(page)
+    if scripts:
+        data = minify_js(";\n".join(scripts)).encode("utf-8")
+        js_path = fingerprint("app.js", data)
+        files[js_path] = data
+        page = INLINE_SCRIPT_RE.sub("", page)
+        page = page.replace("</head>", f'<script src="{js_path}" defer></script>\n</head>', 1)
+
+    return page, files
+
+
+# =================================================
+# COMPRESS + HEADERS
+# =================================================
+def compress_variants(path: str, data: bytes) -> Dict[str, bytes]:
+    if not path.endswith(COMPRESSIBLE) or len(data) < MIN_COMPRESS_BYTES:
+        return {}
+    variants = {path + ".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if HAS_BROTLI:
+        variants[path + ".br"] = brotli.compress(data, quality=11)
+    return {p: v for p, v in variants.items() if len(v) < len(data)}
+
+
+def header_entry(path: str, data: bytes, encodings: Dict[str, str]) -> Dict[str, object]:
+    digest = hashlib.sha256(data).hexdigest()
+    immutable = path.startswith(ASSETS_SUBDIR + "/") and FINGERPRINTED_RE.match(os.path.basename(path))
+    return {
+        "sha256": digest,
+        "bytes": len(data),
+        "etag": f'"{digest[:16]}"',
+        "cache_control": CACHE_IMMUTABLE if immutable else CACHE_HTML,
+        "content_type": CONTENT_TYPES.get(os.path.splitext(path)[1], "application/octet-stream"),
+        "encodings": encodings,
+    }
+
+
+def render_headers_file(manifest: Dict[str, Dict[str, object]]) -> str:
+    """Cloudflare `_headers` format — one block per generated file."""
+    blocks = []
+    for path, entry in sorted(manifest.items()):
+        routes = ["/", f"/{path}"] if path == "index.html" else [f"/{path}"]
+        for route in routes:
+            blocks.append(f"{route}\n  Cache-Control: {entry['cache_control']}\n  ETag: {entry['etag']}\n")
+    return "".join(blocks)
+
+
+def build(page: str, extra: Dict[str, bytes] = None, minify: bool = True) -> Tuple[Dict[str, bytes], Dict[str, Dict[str, object]]]:
+    """
+    page (full index.html) + extra generated files →
+      (every file to write under site/, manifest of the primary files).
+    Compressed variants are included in the files but not listed as manifest keys.
+    """
+    page, files = extract_assets(page)
+    if minify:
+        page = minify_html(page)
+    files["index.html"] = page.encode("utf-8")
+    files.update(extra or {})
+
+    out: Dict[str, bytes] = {}
+    manifest: Dict[str, Dict[str, object]] = {}
+    for path, data in files.items():
+        variants = compress_variants(path, data)
+        out[path] = data
+        out.update(variants)
+        encodings = {("br" if v.endswith(".br") else "gzip"): v[len(path):] for v in variants}
+        manifest[path] = header_entry(path, data, encodings)
+    return out, manifest
+
+
+# =================================================
+# WRITE
+# =================================================
+def write_outputs(site_dir: str, files: Dict[str, bytes]) -> bool:
+    """
+    Write only files whose bytes changed and drop fingerprinted assets
+    from earlier builds. Returns True if anything on disk changed.
+    """
+    changed = False
+    for path, data in files.items():
+        full = os.path.join(site_dir, path)
+        if os.path.exists(full):
+            with open(full, "rb") as f:
+                if f.read() == data:
+                    continue
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "wb") as f:
+            f.write(data)
+        changed = True
+
+    assets_dir = os.path.join(site_dir, ASSETS_SUBDIR)
+    if os.path.isdir(assets_dir):
+        for entry in os.scandir(assets_dir):
+            rel = f"{ASSETS_SUBDIR}/{entry.name}"
+            if entry.is_file() and FINGERPRINTED_RE.match(entry.name) and rel not in files:
+                os.remove(entry.path)
+                changed = True
+
+    # plain index.html.gz / .br from a build whose page was too small to compress
+    for path in [p for p in files if p.endswith(COMPRESSIBLE)]:
+        for suffix in (".gz", ".br"):
+            stale = os.path.join(site_dir, path + suffix)
+            if path + suffix not in files and os.path.exists(stale):
+                os.remove(stale)
+                changed = True
+    return changed
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# bench_portfolio.py — scalability benchmark: synthetic orgs → gh_replay.py → full generator run
+#
+#   ./bench_portfolio.py                       100 / 1k / 10k repos, rest + graphql, cold + warm
+#   ./bench_portfolio.py --sizes 1000 --engines rest
+#   ./bench_portfolio.py --compare             latest results vs. the previous commit's
+
+import os, sys, json, time, socket, random, shutil, hashlib, platform, subprocess
+from typing import Any, Dict, List, Optional
+
+from config import ORG_NAME, SCRIPT_DIR, LCYN, LGRE, LYEL, LRED, LMAG, WHTE, RES
+import gh_replay
+
+BENCH_DIR = os.path.join(SCRIPT_DIR, ".bench")                # fixtures + scratch runs (ignored)
+RESULTS_FILE = os.path.join(SCRIPT_DIR, "bench_results.jsonl")  # committed, one line per run
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_ENGINES = ["rest", "graphql"]
+PHASES = ["cold", "warm"]  # warm = second run on the same cache (304s / fresh repos / cached cards)
+REST_PAGE_SIZE = 100
+REGRESSION_PCT = 10.0       # --compare flags metrics that got this much worse
+SEED = 1919
+
+# =================================================
+# SYNTHETIC ORG (seeded → identical fixtures on every machine)
+# =================================================
+STACKS = [
+    # (name parts, topics, languages by weight, top-level files)
+    (["terraform", "aws", "vpc", "eks", "modules"], ["terraform", "aws", "iac", "devops"],
+     {"HCL": 8, "Shell": 2, "Python": 1}, ["main.tf", "variables.tf", "outputs.tf", "versions.tf"]),
+    (["ansible", "role", "nginx", "hardening"], ["ansible", "automation", "linux"],
+     {"Jinja": 4, "YAML": 3, "Shell": 1}, ["ansible.cfg", "site.yml", "roles", "inventory"]),
+    (["k8s", "helm", "charts", "operator"], ["kubernetes", "helm", "gitops"],
+     {"Go": 5, "Smarty": 2, "Makefile": 1}, ["helm", "Chart.yaml", "values.yaml", "Dockerfile"]),
+    (["flask", "fastapi", "api", "service"], ["python", "api", "backend"],
+     {"Python": 9, "HTML": 2, "Dockerfile": 1}, ["app.py", "requirements.txt", "Dockerfile", "tests"]),
+    (["react", "dashboard", "frontend", "ui"], ["react", "frontend", "typescript"],
+     {"TypeScript": 7, "JavaScript": 3, "CSS": 2}, ["package.json", "src", "public", "tsconfig.json"]),
+    (["java", "spring", "batch", "service"], ["java", "spring-boot", "microservices"],
+     {"Java": 9, "Shell": 1}, ["pom.xml", "src", "mvnw", "Dockerfile"]),
+    (["scripts", "bash", "tools", "ops"], ["bash", "automation", "sre"],
+     {"Shell": 6, "PowerShell": 2, "Batchfile": 1}, ["install.sh", "bin", "lib"]),
+]
+COMMON_FILES = ["README.md", ".gitignore", "LICENSE", ".github"]
+WORDS = ("automated pipeline for provisioning monitoring deploying scalable secure cloud "
+         "infrastructure services with observability and zero-downtime releases").split()
+
+
+def synth_repo(i: int, rng: random.Random) -> Dict[str, Any]:
+    parts, topics, langs, files = rng.choice(STACKS)
+    name = f"{'-'.join(rng.sample(parts, 2))}-{i:05d}"
+    ranked = sorted(langs, key=lambda l: -langs[l] * rng.random())
+    stamp = f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00Z"
+    return {
+        "name": name,
+        "full_name": f"{ORG_NAME}/{name}",
+        "html_url": f"https://github.com/{ORG_NAME}/{name}",
+        "description": " ".join(rng.sample(WORDS, rng.randint(4, 10))).capitalize() if rng.random() > 0.1 else None,
+        "stargazers_count": int(rng.paretovariate(1.5)) - 1,
+        "topics": sorted(rng.sample(topics, rng.randint(1, len(topics)))),
+        "private": False,
+        "fork": False,
+        "pushed_at": stamp,
+        "updated_at": stamp,
+        "languages": {l: rng.randint(1_000, 500_000) for l in ranked[:rng.randint(1, len(ranked))]},
+        "files": COMMON_FILES[:rng.randint(1, len(COMMON_FILES))] + rng.sample(files, rng.randint(1, len(files))),
+        "sha": hashlib.sha1(f"{SEED}-{i}".encode()).hexdigest(),
+    }
+
+
+def entry(method: str, path: str, body: Any, headers: Dict[str, str] = None,
+          request_body: Optional[bytes] = None) -> Dict[str, Any]:
+    text = json.dumps(body)
+    return {
+        "method": method, "path": path, "body_key": gh_replay.body_key(request_body), "status": 200,
+        "headers": {"Content-Type": "application/json; charset=utf-8",
+                    "ETag": f'"{hashlib.sha256(text.encode()).hexdigest()[:20]}"',
+                    "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4999",
+                    "X-RateLimit-Reset": "9999999999", **(headers or {})},
+        "body": text,
+    }
+
+
+def synth_cassette(n: int) -> Dict[str, Any]:
+    """REST listing + per-repo /languages, /contents and the GraphQL pages for an n-repo org."""
+    from generate_portfolio_page import REPOS_QUERY, GRAPHQL_PAGE_SIZE  # just the query text
+
+    rng = random.Random(SEED)
+    repos = [synth_repo(i, rng) for i in range(n)]
+    rest_keys = ("name", "full_name", "html_url", "description", "stargazers_count",
+                 "topics", "private", "fork", "pushed_at", "updated_at")
+    entries = []
+
+    # listing: page 1 only — gh_replay merges + re-paginates from there
+    listing = [{k: r[k] for k in rest_keys} for r in repos]
+    entries.append(entry("GET", f"/orgs/{ORG_NAME}/repos?per_page={REST_PAGE_SIZE}&page=1", listing))
+    for r in repos:
+        entries.append(entry("GET", f"/repos/{r['full_name']}/languages", r["languages"]))
+        entries.append(entry("GET", f"/repos/{r['full_name']}/contents",
+                             [{"name": f, "type": "file"} for f in r["files"]]))
+
+    after = None
+    for start in range(0, n, GRAPHQL_PAGE_SIZE):
+        chunk = repos[start:start + GRAPHQL_PAGE_SIZE]
+        cursor = f"cursor{start + len(chunk)}"
+        nodes = [{
+            "name": r["name"], "nameWithOwner": r["full_name"], "url": r["html_url"],
+            "description": r["description"], "stargazerCount": r["stargazers_count"],
+            "isPrivate": False, "isFork": False, "pushedAt": r["pushed_at"], "updatedAt": r["updated_at"],
+            "defaultBranchRef": {"target": {"oid": r["sha"]}},
+            "repositoryTopics": {"nodes": [{"topic": {"name": t}} for t in r["topics"]]},
+            "languages": {"nodes": [{"name": l} for l in r["languages"]]},
+            "object": {"entries": [{"name": f} for f in r["files"]]},
+        } for r in chunk]
+        body = {"data": {
+            "organization": {"repositories": {
+                "pageInfo": {"hasNextPage": start + len(chunk) < n, "endCursor": cursor},
+                "nodes": nodes,
+            }},
+            "rateLimit": {"cost": 1, "remaining": 4999},
+        }}
+        payload = {"query": REPOS_QUERY, "variables": {"org": ORG_NAME, "first": GRAPHQL_PAGE_SIZE, "after": after}}
+        entries.append(entry("POST", "/graphql", body, request_body=json.dumps(payload).encode("utf-8")))
+        after = cursor
+
+    return {"v": gh_replay.CASSETTE_VERSION, "base": "https://api.github.com",
+            "recorded_at": 0, "synthetic": {"repos": n, "seed": SEED}, "entries": entries}
+
+
+def fixture_dir(n: int) -> str:
+    """Generated once per size (and per SEED); reused across runs."""
+    directory = os.path.join(BENCH_DIR, f"fixtures-{n}-{SEED}")
+    if not os.path.isfile(os.path.join(directory, gh_replay.CASSETTE_FILE)):
+        print(f"{LCYN}🧪 Generating synthetic org: {n:,} repos…{RES}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, gh_replay.CASSETTE_FILE), "w", encoding="utf-8") as f:
+            json.dump(synth_cassette(n), f)
+    return directory
+
+
+# =================================================
+# RUN
+# =================================================
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"replay server didn't come up on :{port}")
+
+
+def run_measured(cmd: List[str], cwd: str, env: Dict[str, str], log_path: str):
+    """(exit code, wall seconds, peak RSS bytes) of one child process."""
+    with open(log_path, "w") as log:
+        started = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - started
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss: kilobytes on Linux, bytes on macOS
+    rss = usage.ru_maxrss if platform.system() == "Darwin" else usage.ru_maxrss * 1024
+    return proc.returncode, wall, rss
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+def git_version() -> str:
+    try:
+        sha = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR,
+                                      text=True, stderr=subprocess.DEVNULL).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD"], cwd=SCRIPT_DIR,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) != 0
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_one(n: int, engine: str, version: str) -> List[Dict[str, Any]]:
+    fixtures = fixture_dir(n)
+    work = os.path.join(BENCH_DIR, f"run-{n}-{engine}")
+    shutil.rmtree(work, ignore_errors=True)
+    os.makedirs(work)
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, "gh_replay.py"), fixtures, "--port", str(port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    results = []
+    try:
+        wait_for_port(port)
+        env = {
+            **os.environ,
+            "GITHUB_API_URL": f"http://127.0.0.1:{port}",
+            "GITHUB_TOKEN": os.environ.get("GITHUB_TOKEN", "bench"),
+            "PORTFOLIO_CACHE_DB": os.path.join(work, "cache.db"),
+            "PORTFOLIO_RATE_LIMIT_RPS": "1e9",  # measure the generator, not GitHub's pacing
+        }
+        for phase in PHASES:
+            report_path = os.path.join(work, f"report-{phase}.json")
+            cmd = [sys.executable, os.path.join(SCRIPT_DIR, "generate_portfolio_page.py"),
+                   "--engine", engine, "--report", report_path]
+            code, wall, rss = run_measured(cmd, work, env, os.path.join(work, f"log-{phase}.txt"))
+            if code != 0:
+                print(f"{LRED}❌ {n:,} repos / {engine} / {phase}: exit {code} (see {work}/log-{phase}.txt){RES}")
+                break
+
+            with open(report_path) as f:
+                report = json.load(f)
+            site = os.path.join(work, "site")
+            result = {
+                "version": version,
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "repos": n,
+                "engine": engine,
+                "phase": phase,
+                "wall_s": round(wall, 3),
+                "requests": report["requests"]["total"],
+                "request_bytes": report["requests"]["bytes"],
+                "peak_rss_mb": round(rss / 1e6, 1),
+                "site_bytes": dir_size(site),
+                "index_html_bytes": os.path.getsize(os.path.join(site, "index.html")),
+                "stages": {k: v["seconds"] for k, v in report["stages"].items()},
+            }
+            results.append(result)
+            print(f"{LGRE}✔ {n:>6,} repos  {engine:<7} {phase:<4}  {wall:7.2f}s  "
+                  f"{result['requests']:>6} req  {result['peak_rss_mb']:7.1f} MB RSS  "
+                  f"{result['site_bytes'] / 1e6:6.2f} MB site{RES}")
+    finally:
+        server.terminate()
+        server.wait()
+    return results
+
+
+# =================================================
+# RESULTS
+# =================================================
+METRICS = ["wall_s", "requests", "peak_rss_mb", "site_bytes"]
+
+
+def load_results() -> List[Dict[str, Any]]:
+    if not os.path.isfile(RESULTS_FILE):
+        return []
+    with open(RESULTS_FILE) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_results(results: List[Dict[str, Any]]):
+    with open(RESULTS_FILE, "a") as f:
+        for r in results:
+            f.write(json.dumps(r, sort_keys=True) + "\n")
+
+
+def compare(results: List[Dict[str, Any]]) -> int:
+    """Latest run per (repos, engine, phase) vs. the latest from a different version. Returns regressions."""
+    latest: Dict[tuple, Dict[str, Any]] = {}
+    previous: Dict[tuple, Dict[str, Any]] = {}
+    for r in results:
+        latest[(r["repos"], r["engine"], r["phase"])] = r
+    for r in results:
+        key = (r["repos"], r["engine"], r["phase"])
+        if r["version"] != latest[key]["version"]:
+            previous[key] = r
+
+    regressions = 0
+    for key in sorted(latest):
+        now, before = latest[key], previous.get(key)
+        if not before:
+            continue
+        print(f"{WHTE}{key[0]:>6,} repos  {key[1]:<7} {key[2]:<4}  {before['version']} → {now['version']}{RES}")
+        for m in METRICS:
+            old, new = before[m], now[m]
+            pct = (new - old) / old * 100 if old else 0.0
+            color = LRED if pct > REGRESSION_PCT else LGRE if pct < -REGRESSION_PCT else LCYN
+            regressions += pct > REGRESSION_PCT
+            print(f"{color}    {m:<12} {old:>12,} → {new:>12,}  ({pct:+.1f}%){RES}")
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the generator against synthetic orgs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--engines", nargs="+", choices=DEFAULT_ENGINES, default=DEFAULT_ENGINES)
+    parser.add_argument("--no-save", action="store_true", help=f"don't append to {os.path.basename(RESULTS_FILE)}")
+    parser.add_argument("--compare", action="store_true",
+                        help=f"only compare stored results; exit 1 on a >{REGRESSION_PCT:.0f}%% regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        exit(1 if compare(load_results()) else 0)
+
+    version = git_version()
+    print(f"{LMAG}🏁 Benchmark @ {version}: sizes {args.sizes}, engines {args.engines}{RES}")
+    results = []
+    for n in args.sizes:
+        for engine in args.engines:
+            results += bench_one(n, engine, version)
+
+    if results and not args.no_save:
+        append_results(results)
+        print(f"{LCYN}🧾 {len(results)} result(s) → {RESULTS_FILE}{RES}")
+    if not results:
+        print(f"{LYEL}⚠️ No successful runs{RES}")
+        exit(1)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# cache_store.py — SQLite-backed cache for repo data + HTTP validators
+
+import os, json, sqlite3, time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config import SCRIPT_DIR
+
+CACHE_DB_FILE = os.getenv("PORTFOLIO_CACHE_DB") or os.path.join(SCRIPT_DIR, ".portfolio_cache.db")
+LEGACY_CONTENTS_FILE = os.path.join(SCRIPT_DIR, ".contents_cache.json")
+CACHE_BATCH_SIZE = 100  # pending upserts before an automatic flush
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    full_name  TEXT PRIMARY KEY,
+    pushed_at  TEXT,
+    updated_at TEXT,
+    sha        TEXT,
+    languages  TEXT,
+    contents   TEXT,
+    fetched_at REAL
+);
+CREATE TABLE IF NOT EXISTS http (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    link          TEXT,
+    body          TEXT,
+    fetched_at    REAL
+);
+CREATE TABLE IF NOT EXISTS fragments (
+    name TEXT PRIMARY KEY,
+    key  TEXT NOT NULL,
+    html TEXT NOT NULL
+);
+"""
+
+REPO_COLUMNS = ("pushed_at", "updated_at", "sha", "languages", "contents")
+JSON_COLUMNS = ("languages", "contents")
+
+
+class CacheStore:
+    """
+    One row per repo (freshness stamp, languages, top-level contents) and
+    one row per URL (ETag / Last-Modified + body), plus rendered card HTML
+    keyed by a hash of the fields it uses. Writes are buffered in
+    memory and committed in a single transaction per batch, so a cold build
+    does a handful of commits instead of rewriting a JSON file per repo.
+    The database is only opened on first use.
+    """
+
+    def __init__(self, path: str = CACHE_DB_FILE, legacy_json: str = LEGACY_CONTENTS_FILE,
+                 batch_size: int = CACHE_BATCH_SIZE):
+        self.path = path
+        self.legacy_json = legacy_json
+        self.batch_size = batch_size
+        self.conn: Optional[sqlite3.Connection] = None
+        self.pending_repos: Dict[str, Dict[str, Any]] = {}
+        self.pending_http: Dict[str, Dict[str, Any]] = {}
+        self.pending_fragments: Dict[str, Tuple[str, str]] = {}
+        self.written = 0
+
+    # -------------------------------------------------
+    # connection (lazy) + one-off import of the old JSON cache
+    # -------------------------------------------------
+    def _db(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self._migrate()
+            self._import_legacy()
+        return self.conn
+
+    def _migrate(self):
+        # columns added after the first release of the schema
+        http_cols = {row[1] for row in self.conn.execute("PRAGMA table_info(http)")}
+        if "link" not in http_cols:
+            self.conn.execute("ALTER TABLE http ADD COLUMN link TEXT")
+
+    def _import_legacy(self):
+        if not self.legacy_json or not os.path.exists(self.legacy_json):
+            return
+        if self.conn.execute("SELECT 1 FROM repos LIMIT 1").fetchone():
+            return
+        try:
+            with open(self.legacy_json, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO repos (full_name, contents, fetched_at) VALUES (?, ?, ?)",
+                [(name, json.dumps(items), time.time()) for name, items in legacy.items()],
+            )
+
+    # -------------------------------------------------
+    # repos
+    # -------------------------------------------------
+    def get_repo(self, full_name: str) -> Optional[Dict[str, Any]]:
+        row = self._db().execute(
+            f"SELECT {', '.join(REPO_COLUMNS)} FROM repos WHERE full_name = ?", (full_name,)
+        ).fetchone()
+        entry = None
+        if row:
+            entry = dict(zip(REPO_COLUMNS, row))
+            for col in JSON_COLUMNS:
+                if entry[col] is not None:
+                    entry[col] = json.loads(entry[col])
+        pending = self.pending_repos.get(full_name)
+        if pending:
+            entry = {**(entry or dict.fromkeys(REPO_COLUMNS)), **pending}
+        return entry
+
+    def put_repo(self, full_name: str, **fields):
+        unknown = set(fields) - set(REPO_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown cache columns: {sorted(unknown)}")
+        self.pending_repos.setdefault(full_name, {}).update(fields)
+        self._maybe_flush()
+
+    # -------------------------------------------------
+    # http validators
+    # -------------------------------------------------
+    def get_http(self, url: str) -> Optional[Dict[str, Any]]:
+        if url in self.pending_http:
+            return self.pending_http[url]
+        row = self._db().execute(
+            "SELECT etag, last_modified, link, body FROM http WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, link, body = row
+        return {"etag": etag, "last_modified": last_modified, "link": link, "body": json.loads(body)}
+
+    def put_http(self, url: str, etag: Optional[str], last_modified: Optional[str], body: Any,
+                 link: Optional[str] = None):
+        self.pending_http[url] = {"etag": etag, "last_modified": last_modified, "link": link, "body": body}
+        self._maybe_flush()
+
+    # -------------------------------------------------
+    # rendered card fragments
+    # -------------------------------------------------
+    def all_fragments(self) -> Dict[str, Tuple[str, str]]:
+        """name → (key, html) for every cached card, in one query."""
+        fragments = {name: (key, html) for name, key, html
+                     in self._db().execute("SELECT name, key, html FROM fragments")}
+        fragments.update(self.pending_fragments)
+        return fragments
+
+    def put_fragment(self, name: str, key: str, html: str):
+        self.pending_fragments[name] = (key, html)
+        self._maybe_flush()
+
+    # -------------------------------------------------
+    # writes
+    # -------------------------------------------------
+    def _pending(self) -> int:
+        return len(self.pending_repos) + len(self.pending_http) + len(self.pending_fragments)
+
+    def _maybe_flush(self):
+        if self._pending() >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Commit everything pending in one transaction. Returns rows written."""
+        if not self._pending():
+            return 0
+        db = self._db()
+        now = time.time()
+        rows = 0
+        with db:
+            for full_name, fields in self.pending_repos.items():
+                cols = list(fields)
+                values = [json.dumps(fields[c]) if c in JSON_COLUMNS else fields[c] for c in cols]
+                db.execute(
+                    f"INSERT INTO repos (full_name, {', '.join(cols)}, fetched_at) "
+                    f"VALUES (?, {', '.join('?' * len(cols))}, ?) "
+                    f"ON CONFLICT(full_name) DO UPDATE SET "
+                    f"{', '.join(f'{c} = excluded.{c}' for c in cols)}, fetched_at = excluded.fetched_at",
+                    [full_name, *values, now],
+                )
+                rows += 1
+            db.executemany(
+                "INSERT OR REPLACE INTO http (url, etag, last_modified, link, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(url, e["etag"], e["last_modified"], e["link"], json.dumps(e["body"]), now)
+                 for url, e in self.pending_http.items()],
+            )
+            rows += len(self.pending_http)
+            db.executemany(
+                "INSERT OR REPLACE INTO fragments (name, key, html) VALUES (?, ?, ?)",
+                [(name, key, html) for name, (key, html) in self.pending_fragments.items()],
+            )
+            rows += len(self.pending_fragments)
+        self.pending_repos.clear()
+        self.pending_http.clear()
+        self.pending_fragments.clear()
+        self.written += rows
+        return rows
+
+    def prune(self, names: Iterable[str], full_names: Iterable[str]) -> int:
+        """
+        Delete cards not in `names` and repo rows not in `full_names` (repos
+        deleted, renamed or excluded since they were cached). Only call with a
+        complete listing. Returns rows deleted.
+        """
+        self.flush()
+        names, full_names = set(names), set(full_names)
+        db = self._db()
+        stale_cards = [(n,) for (n,) in db.execute("SELECT name FROM fragments") if n not in names]
+        stale_repos = [(n,) for (n,) in db.execute("SELECT full_name FROM repos") if n not in full_names]
+        with db:
+            db.executemany("DELETE FROM fragments WHERE name = ?", stale_cards)
+            db.executemany("DELETE FROM repos WHERE full_name = ?", stale_repos)
+        return len(stale_cards) + len(stale_repos)
+
+    def close(self):
+        self.flush()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
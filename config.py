@@ -20,6 +20,8 @@ CLEAR = '\033[H\033[J'; ORA = '\033[38;5;208m'
 
 # GITHUB
 ORG_NAME = "MarkM-Portfolio"
+# API base — GITHUB_API_URL=http://127.0.0.1:8765 points every script at gh_replay.py
+GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 REMOTE_PREFIX = f"git@github.com:{ORG_NAME}"
 USERNAME = [ "markmonmonteros", "markmon1919" ]
 NAME = "Mark Monteros"
@@ -38,4 +40,28 @@ DEFAULT_LANG_MAP = { "py": "Python", "js": "JavaScript", "ts": "TypeScript", "ja
                     "css": "CSS", "cpp": "C++", "c": "C", "cs": "C#", "md": "Markdown", "inc": "AWS Infra",
                     "jinja": "Jinja", "tpl": "Template File", "txt": "Text File", "cfg": "Config File",
                     "Dockerfile": "Docker", "dockerignore": "Docker", "pem": "PEM Key"}
-CV_FILE = "Mark Mon Monteros - CV (DevOps).pdf"
\ No newline at end of file
+CV_FILE = "Mark Mon Monteros - CV (DevOps).pdf"
+
+# HTTP TRANSPORT (keep-alive pool shared by every script)
+HTTP_POOL_SIZE = 20            # total open connections
+HTTP_PER_HOST_LIMIT = 20       # connections per host (api.github.com)
+HTTP_KEEPALIVE_TIMEOUT = 30    # seconds an idle connection stays open
+HTTP_DNS_CACHE_TTL = 300       # seconds
+HTTP2 = True                   # sync scripts use httpx[http2] when installed
+
+# RATE LIMIT SCHEDULER (token bucket shared by all in-flight requests)
+# steady pace — GitHub's secondary limit is ~900 REST points/min (env override: bench_portfolio.py)
+RATE_LIMIT_RPS = float(os.getenv("PORTFOLIO_RATE_LIMIT_RPS", 15))
+RATE_LIMIT_BURST = 100         # requests allowed back-to-back before pacing kicks in
+RATE_LIMIT_MIN_RPS = 0.2       # floor when the remaining budget is nearly spent
+RATE_LIMIT_LOW_WATER = 500     # start stretching the budget below this many requests left
+
+# SITE OUTPUT (--shard: first screen inline, the rest as lazily loaded JSON)
+SHARD_FIRST_SCREEN = 24        # cards rendered straight into index.html
+SHARD_SIZE = 60                # cards per JSON shard fetched on scroll
+FACET_TOP_N = 20               # filter chips per facet (most common languages / topics)
+
+# PUSH PIPELINE (portfolio.py push — local prep in processes, network in threads)
+PUSH_PREP_WORKERS = min(4, os.cpu_count() or 1)  # wipe history / scan / commit, one process each
+PUSH_NET_WORKERS = 4           # create repo / git push / topics running at once
+PUSH_FAST_IMPORT = True        # initial commit streamed from the scan into git fast-import (--git-add: old path)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# facets.py — build-time language / topic facets as per-value card bitsets
+
+import json, base64
+from typing import Dict, List
+
+FACETS_VERSION = 1
+FACET_FIELDS = {"language": "languages", "topic": "topics"}  # facet → repo key
+
+
+def card_facets(repo) -> Dict[str, List[str]]:
+    """Facet values of one card: languages (incl. detected extras) and topics."""
+    return {facet: list(dict.fromkeys(repo.get(key) or [])) for facet, key in FACET_FIELDS.items()}
+
+
+def bitset(ids: List[int], n: int) -> bytes:
+    """Bit i (LSB-first within each byte) set ⇔ card i has the value."""
+    bits = bytearray((n + 7) // 8)
+    for card_id in ids:
+        bits[card_id >> 3] |= 1 << (card_id & 7)
+    return bytes(bits)
+
+
+def build_facets(cards: List[Dict[str, List[str]]], top_n: int = 0) -> Dict[str, object]:
+    """
+    cards[i] is card_facets() of the i-th card on the page (DOM order, same
+    ids as the search index).
+
+    counts — [[value, count], ...] per facet, most common first (top_n caps it)
+    bits   — value → base64 bitset over card ids; the page ANDs them per chip
+    """
+    n = len(cards)
+    counts: Dict[str, List[List[object]]] = {}
+    bits: Dict[str, Dict[str, str]] = {}
+    for facet in FACET_FIELDS:
+        ids: Dict[str, List[int]] = {}
+        for card_id, values in enumerate(cards):
+            for value in values.get(facet, []):
+                ids.setdefault(value, []).append(card_id)
+
+        ranked = sorted(ids, key=lambda v: (-len(ids[v]), v.lower()))
+        if top_n:
+            ranked = ranked[:top_n]
+        counts[facet] = [[v, len(ids[v])] for v in ranked]
+        bits[facet] = {v: base64.b64encode(bitset(ids[v], n)).decode("ascii") for v in ranked}
+
+    return {"v": FACETS_VERSION, "n": n, "counts": counts, "bits": bits}
+
+
+def encode(facets: Dict[str, object]) -> bytes:
+    return json.dumps(facets, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# fast_commit.py — build the initial commit with `git fast-import` from the scanner's file list
+#
+# After remove_git_history the index is empty, so `git add -A` re-stats and
+# re-hashes the whole tree and writes an index before `git commit` can run.
+# The scan has already decided which files get committed (same ignore rules
+# as git), so here they're streamed as blobs, plus one commit, straight into
+# fast-import. It takes one pass and needs no index. The result is the same
+# tree `git add -A && git commit` would produce, including LFS pointers for
+# the files plan_git_lfs picked. Repos the scanner can't vouch for (embedded
+# repos, nested .gitattributes, autocrlf, a file list that differs from
+# `git ls-files -co --exclude-standard`) return False, and the caller falls
+# back to git add.
+
+import os, hashlib, tempfile, subprocess
+from typing import Dict, Optional, Set
+
+from repo_scan import RepoIndex
+
+LFS_SPEC = "https://git-lfs.github.com/spec/v1"
+CHUNK = 1 << 20
+
+
+def quote_path(path: str) -> bytes:
+    raw = os.fsencode(path)
+    if not raw.startswith(b'"') and b"\n" not in raw:
+        return raw
+    escaped = raw.replace(b"\\", b"\\\\").replace(b'"', b'\\"').replace(b"\n", b"\\n")
+    return b'"' + escaped + b'"'
+
+
+def git_idents(repo: str) -> Dict[str, str]:
+    """GIT_AUTHOR_IDENT / GIT_COMMITTER_IDENT exactly as `git commit` would use them (config + env)."""
+    out = subprocess.run(["git", "var", "-l"], cwd=repo, capture_output=True, text=True, check=True).stdout
+    idents = {}
+    for line in out.splitlines():
+        key, _, value = line.partition("=")
+        if key in ("GIT_AUTHOR_IDENT", "GIT_COMMITTER_IDENT"):
+            idents[key] = value
+        elif key in ("core.autocrlf", "core.ignorecase"):
+            idents[key] = value.lower()
+    return idents
+
+
+def git_listing(repo: str) -> Set[str]:
+    """Every path `git add -A` would stage, as git's own ignore rules decide."""
+    out = subprocess.run(["git", "ls-files", "-z", "-co", "--exclude-standard"], cwd=repo,
+                         capture_output=True, check=True).stdout
+    return {os.fsdecode(p) for p in out.split(b"\0") if p}
+
+
+def unsupported(index: RepoIndex, idents: Dict[str, str], listed: Set[str]) -> Optional[str]:
+    if index.embedded:
+        return f"embedded git repo(s): {', '.join(index.embedded[:3])}"
+    differ = listed.symmetric_difference(index.files)
+    if differ:
+        return f"scan disagrees with git's ignore rules ({len(differ)} paths, e.g. {min(differ)})"
+    if idents.get("core.ignorecase") in ("true", "yes", "on", "1") and \
+            len({p.lower() for p in index.files}) < len(index.files):
+        return "paths differing only in case, with core.ignorecase set"
+    nested = [p for p in index.files if p.endswith("/.gitattributes")]
+    if nested:
+        return f"nested .gitattributes: {', '.join(nested[:3])}"
+    if idents.get("core.autocrlf") in ("true", "input"):
+        return "core.autocrlf converts line endings on add"
+    if "GIT_AUTHOR_IDENT" not in idents or "GIT_COMMITTER_IDENT" not in idents:
+        return "no git identity"
+    return None
+
+
+def store_lfs_object(repo: str, path: str) -> bytes:
+    """What the LFS clean filter does on add: copy into .git/lfs/objects, return the pointer file."""
+    tmp_dir = os.path.join(repo, ".git", "lfs", "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    digest, size = hashlib.sha256(), 0
+    with open(os.path.join(repo, path), "rb") as src, \
+         tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+        for chunk in iter(lambda: src.read(CHUNK), b""):
+            digest.update(chunk)
+            tmp.write(chunk)
+            size += len(chunk)
+    oid = digest.hexdigest()
+    target = os.path.join(repo, ".git", "lfs", "objects", oid[:2], oid[2:4], oid)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(tmp.name, target)
+    return f"version {LFS_SPEC}\noid sha256:{oid}\nsize {size}\n".encode()
+
+
+def write_blob(stream, mark: int, data: Optional[bytes] = None, path: Optional[str] = None):
+    stream.write(b"blob\nmark :%d\n" % mark)
+    if data is not None:
+        stream.write(b"data %d\n" % len(data))
+        stream.write(data)
+    else:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            stream.write(b"data %d\n" % size)
+            copied = 0
+            for chunk in iter(lambda: f.read(min(CHUNK, size - copied)), b""):
+                stream.write(chunk)
+                copied += len(chunk)
+            if copied != size:
+                raise OSError(f"{path} changed size while committing")
+    stream.write(b"\n")
+
+
+def commit(repo: str, index: RepoIndex, branch: str, message: str) -> bool:
+    """
+    Create `branch`'s first commit from index.files. Returns False (nothing
+    written) when this repo needs the git add path instead.
+    """
+    try:
+        idents = git_idents(repo)
+        listed = git_listing(repo)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️ fast-import skipped: {e}")
+        return False
+    reason = unsupported(index, idents, listed)
+    if reason:
+        print(f"⚠️ fast-import skipped ({reason}) — using git add")
+        return False
+
+    proc = subprocess.Popen(["git", "fast-import", "--quiet", "--done"], cwd=repo,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    tree = []
+    try:
+        stream = proc.stdin
+        stream.write(b"feature done\n")
+        for mark, f in enumerate(sorted(index.files.values()), start=1):
+            full = os.path.join(repo, f.path)
+            if f.link is not None:
+                write_blob(stream, mark, data=os.fsencode(f.link))
+            elif f.path in index.lfs:
+                write_blob(stream, mark, data=store_lfs_object(repo, f.path))
+            else:
+                write_blob(stream, mark, path=full)
+            tree.append(b"M %s :%d %s\n" % (f.mode.encode(), mark, quote_path(f.path)))
+
+        msg = (message.rstrip("\n") + "\n").encode("utf-8")
+        stream.write(b"commit refs/heads/%s\n" % branch.encode())
+        stream.write(b"author %s\n" % idents["GIT_AUTHOR_IDENT"].encode("utf-8"))
+        stream.write(b"committer %s\n" % idents["GIT_COMMITTER_IDENT"].encode("utf-8"))
+        stream.write(b"data %d\n%s" % (len(msg), msg))
+        stream.writelines(tree)
+        stream.write(b"\ndone\n")
+        stream.close()
+    except BrokenPipeError:
+        pass  # fast-import died; its output below says why
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    output = proc.stdout.read().decode("utf-8", errors="replace")
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, "git fast-import", output)
+
+    # index = the new tree, so `git status` in the folder is clean (stat data fills in lazily)
+    subprocess.run(["git", "read-tree", branch], cwd=repo, check=True)
+    print(f"📝 Committed {len(tree)} files via fast-import")
+    return True
@@ -1,21 +1,34 @@
 #!/usr/bin/env python3
 # generate_site.py — async GitHub repo index generator with colors
 
-import aiohttp, asyncio, os, json, time
+import aiohttp, asyncio, os, json, time, sqlite3, hashlib, re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from aiohttp import TCPConnector, ClientError, ClientConnectorError
+from typing import List, Dict, Any, Optional, Tuple, Set
+from aiohttp import ClientError, ClientConnectorError
 
 # -------------------------------------------------
 # CONFIG from your config.py
 # -------------------------------------------------
 from config import (
-    ORG_NAME, REMOTE_PREFIX, USERNAME, NAME, EMAIL, BRANCH, SCRIPT_DIR,
+    ORG_NAME, GITHUB_API, REMOTE_PREFIX, USERNAME, NAME, EMAIL, BRANCH, SCRIPT_DIR,
     TOKEN_FILE, EXCLUDE_REPOS, EXCLUDE_PATHS, DEFAULT_LANG_MAP, SITE_DIR,
     LRED, LBLU, LCYN, LYEL, LMAG, LGRE, LGRY, RED, MAG, YEL, CV_FILE,
     GRE, CYN, BLU, WHTE, BLRED, BLYEL, BLGRE, BLMAG, BLBLU, ORA,
-    BLCYN, BYEL, BMAG, BCYN, BWHTE, DGRY, BLNK, CLEAR, RES
+    BLCYN, BYEL, BMAG, BCYN, BWHTE, DGRY, BLNK, CLEAR, RES,
+    SHARD_FIRST_SCREEN, SHARD_SIZE, FACET_TOP_N
 )
+from cache_store import CacheStore
+from http_cache import HttpCache
+from transport import make_async_session
+from rate_limiter import RateLimitScheduler
+import template_engine as templates
+from template_engine import Markup, Template
+import asset_pipeline as assets
+import search_index
+import facets
+import lang_classifier
+import metrics
+import github_api  # token + headers, read on first request (not at import)
 
 # =================================================
 # COLOR PRINT HELPERS (restored)
@@ -27,24 +40,6 @@ def p_err(msg):  print(f"{LRED}{msg}{RES}")
 def p_mag(msg):  print(f"{LMAG}{msg}{RES}")
 def p_blue(msg): print(f"{LBLU}{msg}{RES}")
 
-# =================================================
-# TOKEN
-# =================================================
-if os.path.isfile(TOKEN_FILE) and os.stat(TOKEN_FILE).st_size > 0:
-    with open(TOKEN_FILE, "r", encoding="utf-8") as tf:
-        GITHUB_TOKEN = tf.read().strip()
-        p_good(f"🔐 Loaded GitHub token from file: {TOKEN_FILE}")
-else:
-    GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-    p_warn("⚠️ TOKEN_FILE missing — using $GITHUB_TOKEN")
-
-HEADERS = {
-    "Accept": "application/vnd.github.mercy-preview+json",
-    "Connection": "close"
-}
-if GITHUB_TOKEN:
-    HEADERS["Authorization"] = f"token {GITHUB_TOKEN}"
-
 # =================================================
 # LANGUAGE COLORS
 # =================================================
@@ -73,124 +68,272 @@ LANG_COLORS = {
 }
 
 # =================================================
-# CACHE
+# CACHE (SQLite — opened lazily, written in batches)
 # =================================================
-CACHE_FILE = os.path.join(SCRIPT_DIR, ".contents_cache.json")
-CONTENTS_CACHE: Dict[str, List[str]] = {}
-if os.path.exists(CACHE_FILE):
-    try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            CONTENTS_CACHE = json.load(f)
-            p_info(f"📦 Loaded contents cache ({len(CONTENTS_CACHE)} repos)")
-    except:
-        p_warn("⚠️ Failed to load cache, starting empty")
+STORE = CacheStore()
 
-def save_cache():
+# ETag / Last-Modified validators for every GET → 304s are free
+HTTP_CACHE = HttpCache(STORE)
+
+def save_cache(listed: Optional["CardRenderer"] = None):
+    """Flush pending writes; given every listed repo's card, also drop cache rows for repos no longer listed."""
     try:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(CONTENTS_CACHE, f, indent=2)
-        p_good("💾 Saved cache")
-    except:
-        p_warn("⚠️ Failed saving cache")
+        rows = STORE.flush()
+        if rows:
+            p_good(f"💾 Saved cache ({rows} rows)")
+        if listed is not None:
+            pruned = STORE.prune(listed.names(), listed.full_names)
+            if pruned:
+                p_info(f"🧹 Pruned {pruned} cache rows of repos no longer listed")
+    except sqlite3.Error as e:
+        p_warn(f"⚠️ Failed saving cache: {e}")
 
 # =================================================
 # ASYNC HTTP HELPERS (WITH COLOR PRINTS)
 # =================================================
 MAX_ATTEMPTS = 5
 BACKOFF_BASE = 1
+RATE_LIMIT_RETRIES = 5  # rate-limited responses retried (after the pause) before giving up on a URL
 CONCURRENT_CONNECTIONS = 20
 REQUEST_TIMEOUT = 15
 
-async def fetch_json(session: aiohttp.ClientSession, url: str, attempt: int = 1) -> Optional[Any]:
-    try:
-        async with session.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT) as resp:
+# One scheduler per budget: REST ("core") and GraphQL are metered separately
+CORE_LIMITER = RateLimitScheduler()
+GRAPHQL_LIMITER = RateLimitScheduler()
 
-            # RATE LIMIT
-            if resp.status == 403 and resp.headers.get("X-RateLimit-Remaining") == "0":
-                reset_ts = int(resp.headers.get("X-RateLimit-Reset", time.time() + 60))
-                wait_for = max(0, reset_ts - int(time.time()))
-                p_warn(f"🛑 RATE LIMIT — sleeping {wait_for}s → {url}")
-                await asyncio.sleep(wait_for)
-                return await fetch_json(session, url, attempt)
+# latency / status / bytes per request, per-repo and per-stage timings → run report
+METRICS = metrics.BuildMetrics()
 
-            if resp.status == 200:
-                return await resp.json()
+# --record DIR: a gh_replay.Recorder keeping every response fetch_json / post_graphql
+# sees; gh_replay (and aiohttp.web) is only imported when recording
+RECORDER = None
 
-            p_warn(f"⚠️ HTTP {resp.status} for {url}")
-            return None
+async def fetch_json(session: aiohttp.ClientSession, url: str, not_found: Optional[Any] = None) -> Optional[Any]:
+    data, _ = await fetch_page(session, url, not_found)
+    return data
 
-    except (ClientConnectorError, ClientError, asyncio.TimeoutError) as e:
-        if attempt < MAX_ATTEMPTS:
-            backoff = BACKOFF_BASE * (2 ** (attempt - 1))
-            p_warn(f"⚠️ Error: {e} — attempt {attempt}/{MAX_ATTEMPTS}, retry in {backoff}s → {url}")
-            await asyncio.sleep(backoff)
-            return await fetch_json(session, url, attempt + 1)
+async def fetch_page(session: aiohttp.ClientSession, url: str,
+                     not_found: Optional[Any] = None) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    GET url → (json body, Link header). The Link header is replayed from cache on 304.
+    A 404 returns not_found (an answer, not a failure) when one is given.
+    """
+    attempt, limited = 1, 0
+    while True:
+        started = time.perf_counter()
+        try:
+            await CORE_LIMITER.acquire()
+            started = time.perf_counter()  # latency excludes the limiter wait (reported separately)
+            # recording needs full bodies, not 304s
+            headers = {**github_api.headers(), **({} if RECORDER else HTTP_CACHE.conditional_headers(url))}
+            async with session.get(url, headers=headers, timeout=REQUEST_TIMEOUT) as resp:
+                body = await resp.read()
+                METRICS.request("GET", url, resp.status, len(body), time.perf_counter() - started, attempt + limited)
+                if RECORDER:
+                    RECORDER.record("GET", url, None, resp.status, resp.headers, body)
+                paused = CORE_LIMITER.observe(resp.status, resp.headers, body)
+
+                # RATE LIMIT — every task waits in CORE_LIMITER.acquire(), not just this one
+                if CORE_LIMITER.is_rate_limited(resp.status, resp.headers, body):
+                    limited += 1
+                    if limited > RATE_LIMIT_RETRIES:
+                        p_err(f"❌ Still rate limited after {RATE_LIMIT_RETRIES} retries: {url}")
+                        return None, None
+                    if paused:
+                        p_warn(f"🛑 RATE LIMIT — pausing all requests {paused:.0f}s → {url}")
+                    continue
+
+                # NOT MODIFIED — doesn't count against the rate limit
+                if resp.status == 304:
+                    cached = HTTP_CACHE.hit(url)
+                    if cached is not None:
+                        return cached["body"], resp.headers.get("Link") or cached.get("link")
+
+                if resp.status == 200:
+                    data = await resp.json()
+                    HTTP_CACHE.store_response(url, resp.headers, data)
+                    return data, resp.headers.get("Link")
+
+                if resp.status == 404 and not_found is not None:
+                    return not_found, None
+
+                p_warn(f"⚠️ HTTP {resp.status} for {url}")
+                return None, None
+
+        except (ClientConnectorError, ClientError, asyncio.TimeoutError) as e:
+            METRICS.request("GET", url, None, 0, time.perf_counter() - started, attempt + limited,
+                            error=type(e).__name__)
+            if attempt < MAX_ATTEMPTS:
+                backoff = BACKOFF_BASE * (2 ** (attempt - 1))
+                p_warn(f"⚠️ Error: {e} — attempt {attempt}/{MAX_ATTEMPTS}, retry in {backoff}s → {url}")
+                await asyncio.sleep(backoff)
+                attempt += 1
+                continue
+
+            p_err(f"❌ FAILED after {MAX_ATTEMPTS} attempts: {url} ({e})")
+            return None, None
+
+GRAPHQL_URL = f"{GITHUB_API}/graphql"
+
+async def post_graphql(session: aiohttp.ClientSession, query: str, variables: Dict[str, Any]) -> Optional[Any]:
+    attempt, limited = 1, 0
+    while True:
+        started = time.perf_counter()
+        try:
+            await GRAPHQL_LIMITER.acquire()
+            started = time.perf_counter()
+            payload = {"query": query, "variables": variables}
+            async with session.post(GRAPHQL_URL, headers=github_api.headers(), json=payload,
+                                    timeout=REQUEST_TIMEOUT) as resp:
+                raw = await resp.read()
+                METRICS.request("POST", GRAPHQL_URL, resp.status, len(raw), time.perf_counter() - started,
+                                attempt + limited)
+                if RECORDER:
+                    RECORDER.record("POST", GRAPHQL_URL, json.dumps(payload).encode("utf-8"),
+                                    resp.status, resp.headers, raw)
+                paused = GRAPHQL_LIMITER.observe(resp.status, resp.headers, raw)
+
+                # RATE LIMIT
+                if GRAPHQL_LIMITER.is_rate_limited(resp.status, resp.headers, raw):
+                    limited += 1
+                    if limited > RATE_LIMIT_RETRIES:
+                        p_err(f"❌ Still rate limited after {RATE_LIMIT_RETRIES} retries: {GRAPHQL_URL}")
+                        return None
+                    if paused:
+                        p_warn(f"🛑 RATE LIMIT (GraphQL) — pausing {paused:.0f}s")
+                    continue
+
+                if resp.status != 200:
+                    p_warn(f"⚠️ HTTP {resp.status} for {GRAPHQL_URL}")
+                    return None
+
+                body = await resp.json()
+                for err in body.get("errors") or []:
+                    p_warn(f"⚠️ GraphQL: {err.get('message')}")
+                return body.get("data")
+
+        except (ClientConnectorError, ClientError, asyncio.TimeoutError) as e:
+            METRICS.request("POST", GRAPHQL_URL, None, 0, time.perf_counter() - started, attempt + limited,
+                            error=type(e).__name__)
+            if attempt < MAX_ATTEMPTS:
+                backoff = BACKOFF_BASE * (2 ** (attempt - 1))
+                p_warn(f"⚠️ Error: {e} — attempt {attempt}/{MAX_ATTEMPTS}, retry in {backoff}s → {GRAPHQL_URL}")
+                await asyncio.sleep(backoff)
+                attempt += 1
+                continue
+
+            p_err(f"❌ FAILED after {MAX_ATTEMPTS} attempts: {GRAPHQL_URL} ({e})")
+            return None
 
-        p_err(f"❌ FAILED after {MAX_ATTEMPTS} attempts: {url} ({e})")
-        return None
+def is_excluded(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in (n.lower() for n in EXCLUDE_REPOS) or "practice" in lowered
 
 # =================================================
 # FETCH REPO LIST
 # =================================================
-async def fetch_repo_list(session):
-    repos = []
-    page = 1
-    per_page = 100
-
-    while True:
-        url = f"https://api.github.com/orgs/{ORG_NAME}/repos?per_page={per_page}&page={page}"
-        p_blue(f"📄 Fetching repo page {page}…")
-        data = await fetch_json(session, url)
-
-        if not data:
-            break
-
-        repos.extend(data)
-        if len(data) < per_page:
-            break
-
-        page += 1
-
-    p_good(f"📦 Total repos fetched: {len(repos)}")
-    return repos
+REPOS_PER_PAGE = 100
+LAST_PAGE_RE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+LISTING = {"complete": True}  # False once a listing page fails — the cache isn't pruned then
+
+def repos_page_url(page: int) -> str:
+    return f"{GITHUB_API}/orgs/{ORG_NAME}/repos?per_page={REPOS_PER_PAGE}&page={page}"
+
+def last_page_from_link(link: Optional[str]) -> Optional[int]:
+    match = LAST_PAGE_RE.search(link or "")
+    return int(match.group(1)) if match else None
+
+async def iter_repo_pages(session):
+    """
+    Yields filtered pages of repos as they land. Page 1 comes first; its
+    Link rel="last" gives the page count, and pages 2..last are then fetched
+    concurrently (bounded by the pool + rate limiter).
+    EXCLUDE_REPOS / practice filtering is applied to each page on arrival.
+    """
+    p_blue("📄 Fetching repo page 1…")
+    data, link = await fetch_page(session, repos_page_url(1))
+    if data is None:
+        LISTING["complete"] = False
+    if not data:
+        return
+
+    total = len(data)
+    yield [r for r in data if not is_excluded(r["name"])]
+    last = last_page_from_link(link)
+
+    if last:
+        p_blue(f"📄 Fetching repo pages 2…{last} concurrently")
+        for next_page in asyncio.as_completed([fetch_json(session, repos_page_url(p)) for p in range(2, last + 1)]):
+            page_data = await next_page
+            if page_data:
+                total += len(page_data)
+                yield [r for r in page_data if not is_excluded(r["name"])]
+            elif page_data is None:
+                LISTING["complete"] = False
+
+    # no Link header but a full page → fall back to walking page by page
+    elif len(data) == REPOS_PER_PAGE:
+        page = 2
+        while True:
+            p_blue(f"📄 Fetching repo page {page}…")
+            page_data = await fetch_json(session, repos_page_url(page))
+            if page_data is None:
+                LISTING["complete"] = False
+            if not page_data:
+                break
+            total += len(page_data)
+            yield [r for r in page_data if not is_excluded(r["name"])]
+            if len(page_data) < REPOS_PER_PAGE:
+                break
+            page += 1
+
+    p_good(f"📦 Total repos listed: {total}")
 
 # =================================================
 # LANGUAGE + CONTENTS
 # =================================================
 async def fetch_languages(session, full_name):
-    url = f"https://api.github.com/repos/{full_name}/languages"
-    return list((await fetch_json(session, url)) or {})
-
-async def fetch_contents(session, full_name):
-    if full_name in CONTENTS_CACHE:
-        return CONTENTS_CACHE[full_name]
-
-    url = f"https://api.github.com/repos/{full_name}/contents"
+    url = f"{GITHUB_API}/repos/{full_name}/languages"
     data = await fetch_json(session, url)
+    if data is None:
+        return None
 
-    items = []
-    if isinstance(data, list):
-        items = [i.get("name", "").lower() for i in data]
+    langs = list(data)
+    STORE.put_repo(full_name, languages=langs)  # buffered, flushed per batch
+    return langs
 
-    CONTENTS_CACHE[full_name] = items
-    save_cache()
+async def fetch_contents(session, full_name):
+    url = f"{GITHUB_API}/repos/{full_name}/contents"
+    data = await fetch_json(session, url, not_found=[])  # empty repos 404 here: no files, not an error
+    if not isinstance(data, list):
+        return None
+
+    items = [i.get("name", "").lower() for i in data]
+    STORE.put_repo(full_name, contents=items)
     return items
 
 # =================================================
-# EXTRA LANG DETECTION
+# FRESHNESS (skip repos untouched since the last build)
 # =================================================
-def detect_extra_languages(repo_name, topics, items):
-    name = repo_name.lower()
-    topics = [t.lower() for t in topics or []]
-    extras = set()
-
-    if "docker" in name or "dockerfile" in items: extras.add("Dockerfile")
-    if "terraform" in name or any(f.endswith(".tf") for f in items): extras.add("Terraform")
-    if "ansible" in name or "ansible.cfg" in items: extras.add("Ansible")
-    if any(f.endswith((".yaml", ".yml")) for f in items): extras.add("YAML")
-    if "k8s" in name or "helm" in items: extras.add("Kubernetes")
-
-    return list(extras)
+REPO_STATS = {"fresh": 0, "refetched": 0}
+
+def freshness_key(repo):
+    return {
+        "pushed_at": repo.get("pushed_at"),
+        "updated_at": repo.get("updated_at"),
+        "sha": repo.get("default_branch_sha"),
+    }
+
+def is_fresh(cached, repo) -> bool:
+    """Cached languages/contents are still valid if the listing timestamps (and SHA, if known) match."""
+    if not cached or cached["languages"] is None or cached["contents"] is None:
+        return False
+    key = freshness_key(repo)
+    if not key["pushed_at"] and not key["updated_at"]:
+        return False
+    if cached["pushed_at"] != key["pushed_at"] or cached["updated_at"] != key["updated_at"]:
+        return False
+    return not key["sha"] or not cached["sha"] or cached["sha"] == key["sha"]
 
 # =================================================
 # PARALLEL REPO PROCESSING
@@ -198,138 +341,471 @@ def detect_extra_languages(repo_name, topics, items):
 async def process_repo(session, repo):
     name = repo["name"]
     full = repo["full_name"]
-
-    p_info(f"🔧 Processing {name}…")
-
-    languages_task = asyncio.create_task(fetch_languages(session, full))
-    contents_task  = asyncio.create_task(fetch_contents(session, full))
-
-    langs = await languages_task
-    contents = await contents_task
-    extras = detect_extra_languages(name, repo.get("topics", []), contents)
+    started = time.perf_counter()
+
+    cached = STORE.get_repo(full)
+    fresh = not RECORDER and is_fresh(cached, repo)  # a recording must hold every repo's responses
+    if fresh:
+        REPO_STATS["fresh"] += 1
+        p_info(f"♻️ Unchanged since last build → {name}")
+        langs, contents = cached["languages"], cached["contents"]
+    else:
+        REPO_STATS["refetched"] += 1
+        p_info(f"🔧 Processing {name}…")
+
+        languages_task = asyncio.create_task(fetch_languages(session, full))
+        contents_task  = asyncio.create_task(fetch_contents(session, full))
+
+        langs = await languages_task
+        contents = await contents_task
+
+        # only stamp the entry once both halves are in, so failures get retried next run
+        if langs is not None and contents is not None:
+            STORE.put_repo(full, **freshness_key(repo))
+        elif cached:
+            # a failed refetch keeps the last build's data instead of blanking the card
+            langs = cached["languages"] if langs is None else langs
+            contents = cached["contents"] if contents is None else contents
+
+    extras = lang_classifier.extra_languages(name, contents or [])
 
     repo["languages"] = list(dict.fromkeys((langs or []) + extras))  # unique
 
+    METRICS.repo(name, time.perf_counter() - started, fresh)
     p_good(f"✔ Done → {name}")
     return repo
 
 # =================================================
-# HTML GENERATION
+# GRAPHQL BATCH ENGINE (one query per 100 repos)
 # =================================================
-def generate_index(repos):
-    os.makedirs(SITE_DIR, exist_ok=True)
-    index_path = os.path.join(SITE_DIR, "index.html")
-
-    def load_template(name):
-        with open(os.path.join("templates", name), "r", encoding="utf-8") as f:
-            return f.read()
-
-    styles = load_template("styles.css")
-    search = load_template("search.html")
-
-    header = load_template("header.html") \
-        .replace("{ORG_NAME}", ORG_NAME) \
-        .replace("{CV_FILE}", CV_FILE) \
-        .replace("{SEARCH_COMPONENT}", search)
-
-    footer = load_template("footer.html") \
-        .replace("{ORG_NAME}", ORG_NAME) \
-        .replace("{EMAIL}", EMAIL) \
-        .replace("{GH_USERNAME}", USERNAME[1]) \
-        .replace("{USERNAME}", USERNAME[0])
-
-    base_start = load_template("base_start.html") \
-        .replace("{ORG_NAME}", ORG_NAME) \
-        .replace("{STYLES_CSS}", styles) \
-        .replace("{HEADER_HTML}", header)
-
-    base_end = load_template("base_end.html") \
-        .replace("{FOOTER_HTML}", footer)
-
-    with open(index_path, "w", encoding="utf-8") as f:
-        f.write(base_start)
-
-        for repo in repos:
-            name = repo["name"]
-            p_good(f"📌 Writing card {WHTE}→ {ORA}{name}{RES}")
-
-            desc = repo.get("description", "No description provided.")
-            stars = repo.get("stargazers_count", 0)
-            topics = repo.get("topics", [])
-            languages = repo.get("languages", [])
-
-            f.write(f"""
-<a class="card-link" href="{repo['html_url']}" target="_blank" rel="noopener">
-  <div class="card">
-    <div class="card-title">{name}</div>
-    <p class="desc">{desc}</p>
-    <p class="stars">⭐ {stars} stars</p>
-""")
-
-            if topics:
-                f.write("    <div class='topics'>\n")
-                for t in topics:
-                    f.write(f"      <span class='topic'>{t}</span>\n")
-                f.write("    </div>\n")
-
-            if languages:
-                f.write("    <div class='languages'>\n")
-                for l in languages:
-                    color = LANG_COLORS.get(l, "#6e7681")
-                    f.write(f"      <span class='lang' style='background:{color}'>{l}</span>\n")
-                f.write("    </div>\n")
-
-            f.write("  </div>\n</a>\n")
-
-        f.write(base_end)
-
-    p_mag(f"🎉 Index generated → {index_path}")
+GRAPHQL_PAGE_SIZE = 100
+
+REPOS_QUERY = """
+query($org: String!, $first: Int!, $after: String) {
+  organization(login: $org) {
+    repositories(first: $first, after: $after, orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name nameWithOwner url description stargazerCount
+        isPrivate isFork pushedAt updatedAt
+        defaultBranchRef { target { oid } }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { nodes { name } }
+        object(expression: "HEAD:") { ... on Tree { entries { name } } }
+      }
+    }
+  }
+  rateLimit { cost remaining }
+}
+"""
+
+def graphql_node_to_repo(node):
+    """Map a GraphQL repository node onto the REST shape CardRenderer reads."""
+    topics = [n["topic"]["name"] for n in (node.get("repositoryTopics") or {}).get("nodes", [])]
+    langs = [n["name"] for n in (node.get("languages") or {}).get("nodes", [])]
+    tree = node.get("object") or {}
+    items = [e.get("name", "").lower() for e in tree.get("entries") or []]
+    extras = lang_classifier.extra_languages(node["name"], items)
+    branch = node.get("defaultBranchRef") or {}
+
+    repo = {
+        "name": node["name"],
+        "full_name": node["nameWithOwner"],
+        "html_url": node["url"],
+        "description": node.get("description"),
+        "stargazers_count": node.get("stargazerCount", 0),
+        "topics": topics,
+        "private": node.get("isPrivate", False),
+        "fork": node.get("isFork", False),
+        "pushed_at": node.get("pushedAt"),
+        "updated_at": node.get("updatedAt"),
+        "default_branch_sha": (branch.get("target") or {}).get("oid"),
+        "languages": list(dict.fromkeys(langs + extras)),  # unique
+    }
+
+    # keep the per-repo cache warm for REST builds
+    STORE.put_repo(repo["full_name"], languages=langs, contents=items, **freshness_key(repo))
+    return repo
 
-# =================================================
-# MAIN ASYNC RUNNER
-# =================================================
-async def main_async():
-    p_mag(f"🚀 START: Building portfolio for {ORG_NAME}")
+async def fetch_repos_graphql(session):
+    repos = []
+    after = None
+    page = 1
 
-    connector = TCPConnector(limit=CONCURRENT_CONNECTIONS, force_close=True)
-    timeout = aiohttp.ClientTimeout(sock_connect=REQUEST_TIMEOUT, sock_read=REQUEST_TIMEOUT)
+    while True:
+        p_blue(f"📄 Fetching GraphQL page {page}…")
+        data = await post_graphql(session, REPOS_QUERY,
+                                  {"org": ORG_NAME, "first": GRAPHQL_PAGE_SIZE, "after": after})
+        org = (data or {}).get("organization")
+        if not org:
+            LISTING["complete"] = False
+            break
 
-    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        conn = org["repositories"]
+        for node in conn["nodes"]:
+            if node and not is_excluded(node["name"]):
+                repos.append(graphql_node_to_repo(node))
 
-        repos = await fetch_repo_list(session)
-        if not repos:
-            p_err("❌ No repos fetched. Aborting.")
-            return
+        rate = data.get("rateLimit") or {}
+        if rate:
+            p_info(f"⏱ GraphQL cost {rate.get('cost')} — {rate.get('remaining')} points left")
 
-        filtered = [
-            r for r in repos
-            if r["name"].lower() not in (name.lower() for name in EXCLUDE_REPOS)
-            and "practice" not in r["name"].lower()
-        ]
+        if not conn["pageInfo"]["hasNextPage"]:
+            break
+        after = conn["pageInfo"]["endCursor"]
+        page += 1
 
-        p_info(f"🧮 {len(filtered)} repos to process (parallel {CONCURRENT_CONNECTIONS})")
+    p_good(f"📦 Total repos fetched (GraphQL): {len(repos)}")
+    return repos
 
-        sem = asyncio.Semaphore(CONCURRENT_CONNECTIONS)
+# =================================================
+# HTML GENERATION
+# =================================================
+CARD_VERSION = 2  # bump when render_card changes (templates/card.html is hashed in)
+MANIFEST_FILE = "build-manifest.json"   # sha256 / ETag / Cache-Control per file (read by worker.js)
+HEADERS_FILE = "_headers"                # same policy in Cloudflare's _headers format
+EXIT_UNCHANGED = 3  # --exit-code: output bytes identical to the last build
+EXIT_FAILED = 1     # no repos fetched — nothing was built, never deploy
+NO_DESCRIPTION = "No description provided."
+
+TOPICS_BLOCK = Template("    <div class='topics'>\n{ITEMS}    </div>\n")
+TOPIC_ITEM = Template("      <span class='topic'>{TOPIC}</span>\n")
+LANGS_BLOCK = Template("    <div class='languages'>\n{ITEMS}    </div>\n")
+LANG_ITEM = Template("      <span class='lang' style='background:{COLOR}'>{LANGUAGE}</span>\n")
+FACET_GROUP = Template("  <div class='facet-group' data-facet='{FACET}'>\n{ITEMS}  </div>\n")
+FACET_CHIP = Template("    <button type='button' class='chip' data-facet='{FACET}' data-value='{VALUE}' "
+                      "aria-pressed='false'>{VALUE} <span class='count'>{COUNT}</span></button>\n")
+
+def card_key(repo, template: Template) -> str:
+    """Hash of every field render_card reads — same key, same HTML."""
+    languages = repo.get("languages", [])
+    fields = [
+        CARD_VERSION, template.digest,
+        repo["name"], repo["html_url"], repo.get("description"),
+        repo.get("stargazers_count", 0), repo.get("topics", []),
+        languages, [LANG_COLORS.get(l) for l in languages],
+    ]
+    return hashlib.sha256(json.dumps(fields).encode("utf-8")).hexdigest()
+
+def render_card(repo, template: Template) -> str:
+    topics = repo.get("topics", [])
+    languages = repo.get("languages", [])
+
+    topics_html = TOPICS_BLOCK.render(
+        ITEMS=Markup("".join(TOPIC_ITEM.render(TOPIC=t) for t in topics))
+    ) if topics else ""
+
+    langs_html = LANGS_BLOCK.render(
+        ITEMS=Markup("".join(LANG_ITEM.render(COLOR=LANG_COLORS.get(l, "#6e7681"), LANGUAGE=l)
+                             for l in languages))
+    ) if languages else ""
+
+    return template.render(
+        HTML_URL=repo["html_url"],
+        NAME=repo["name"],
+        DESCRIPTION=repo.get("description") or NO_DESCRIPTION,
+        STARS=repo.get("stargazers_count", 0),
+        TOPICS=Markup(topics_html),
+        LANGUAGES=Markup(langs_html),
+    )
+
+def render_facet_chips(facet_table, facets_url: str) -> str:
+    """Chips with build-time counts; the bitsets behind them live in facets_url."""
+    groups = "".join(
+        FACET_GROUP.render(FACET=facet, ITEMS=Markup("".join(
+            FACET_CHIP.render(FACET=facet, VALUE=value, COUNT=count) for value, count in counts
+        )))
+        for facet, counts in facet_table["counts"].items() if counts
+    )
+    return templates.load("facets.html").render(FACETS_URL=facets_url, GROUPS=Markup(groups)) if groups else ""
+
+def load_page_shell(search_index_url: str = "", shard_urls: List[str] = None,
+                    total_cards: int = 0, facet_chips: str = "") -> Tuple[str, str]:
+    """(everything before the cards, everything after) with placeholders filled."""
+    header = templates.load("header.html").render(
+        ORG_NAME=ORG_NAME,
+        CV_FILE=CV_FILE,
+        SEARCH_COMPONENT=templates.load("search.html").render(SEARCH_INDEX_URL=search_index_url),
+    )
+
+    footer = templates.load("footer.html").render(
+        ORG_NAME=ORG_NAME,
+        EMAIL=EMAIL,
+        GH_USERNAME=USERNAME[1],
+        USERNAME=USERNAME[0],
+    )
+
+    base_start = templates.load("base_start.html").render(
+        ORG_NAME=ORG_NAME,
+        STYLES_CSS=templates.load_raw("styles.css"),
+        HEADER_HTML=header,
+        FACET_CHIPS=Markup(facet_chips),
+    )
+
+    shards = templates.load("shards.html").render(
+        SHARD_URLS=json.dumps(shard_urls),
+        TOTAL_CARDS=total_cards,
+    ) if shard_urls else ""
+
+    base_end = templates.load("base_end.html").render(CARD_SHARDS=shards, FOOTER_HTML=footer)
+
+    return base_start, base_end
+
+class CardRenderer:
+    """
+    Renders cards as repos arrive (in any order) and keeps only the HTML,
+    not the repo dicts. Cards whose inputs didn't change come from the
+    fragment cache; cards() hands them back sorted by name.
+    """
+
+    def __init__(self):
+        self.fragments = STORE.all_fragments()
+        self.template = templates.load("card.html")  # one stat per build, not two per card
+        self.html: Dict[str, Tuple[str, str]] = {}  # name.lower() → (name, html)
+        self.tokens: Dict[str, Set[str]] = {}       # name.lower() → search tokens
+        self.facets: Dict[str, Dict[str, List[str]]] = {}  # name.lower() → facet values
+        self.full_names: Set[str] = set()           # every repo added (cache pruning)
+        self.rendered = 0
+        self.reused = 0
+
+    def add(self, repo):
+        with METRICS.stage("render_cards"):
+            self._add(repo)
+
+    def _add(self, repo):
+        name = repo["name"]
+        key = card_key(repo, self.template)
+        cached = self.fragments.get(name)
+        if cached and cached[0] == key:
+            html = cached[1]
+            self.reused += 1
+        else:
+            p_good(f"📌 Rendering card {WHTE}→ {ORA}{name}{RES}")
+            html = render_card(repo, self.template)
+            STORE.put_fragment(name, key, html)
+            self.rendered += 1
+        self.html[name.lower()] = (name, html)
+        self.tokens[name.lower()] = search_index.card_tokens(repo)
+        self.facets[name.lower()] = facets.card_facets(repo)
+        self.full_names.add(repo["full_name"])
+
+    def names(self) -> List[str]:
+        return [name for name, _ in self.html.values()]
+
+    def __len__(self):
+        return len(self.html)
+
+    def cards(self) -> List[str]:
+        return [self.html[k][1] for k in sorted(self.html)]
+
+    def search_tokens(self) -> List[Set[str]]:
+        """Token sets in the same order as cards() — list position is the card id."""
+        return [self.tokens[k] for k in sorted(self.html)]
+
+    def facet_values(self) -> List[Dict[str, List[str]]]:
+        """Facet values in cards() order — same card ids as the search index."""
+        return [self.facets[k] for k in sorted(self.html)]
+
+def shard_cards(cards: List[str]) -> Tuple[List[str], Dict[str, bytes]]:
+    """
+    --shard: first screenful stays in index.html, the rest become
+    assets/cards-N.<hash>.json (JSON arrays of card HTML, page order).
+    Returns (inline cards, {shard path: bytes}) — shard order = load order.
+    """
+    inline, rest = cards[:SHARD_FIRST_SCREEN], cards[SHARD_FIRST_SCREEN:]
+    shards: Dict[str, bytes] = {}
+    for n, start in enumerate(range(0, len(rest), SHARD_SIZE)):
+        chunk = [assets.minify_html(card) for card in rest[start:start + SHARD_SIZE]]
+        data = json.dumps(chunk, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        shards[assets.fingerprint(f"cards-{n}.json", data)] = data
+    return inline, shards
+
+def write_index(renderer: CardRenderer, shard: bool = False) -> bool:
+    """
+    Assemble shell + cards, run the asset stage (minify, fingerprint CSS/JS,
+    precompress) and write site/. Returns False if every output byte matched
+    the previous build (nothing written).
+    """
+    os.makedirs(SITE_DIR, exist_ok=True)
+    index_path = os.path.join(SITE_DIR, "index.html")
 
-        async def guarded(repo):
-            async with sem:
-                return await process_repo(session, repo)
+    # search index first — the page links to it by its content hash
+    with METRICS.stage("search_index"):
+        index = search_index.build_index(renderer.search_tokens())
+        index_bytes = search_index.encode(index)
+        index_url = assets.fingerprint("search-index.json", index_bytes)
+    p_info(f"🔎 Search index: {len(index['tokens'])} tokens, {len(index_bytes):,}B")
+
+    with METRICS.stage("facets"):
+        facet_table = facets.build_facets(renderer.facet_values(), top_n=FACET_TOP_N)
+        facet_bytes = facets.encode(facet_table)
+        facets_url = assets.fingerprint("facets.json", facet_bytes)
+    p_info("🏷 Facets: " + ", ".join(f"{len(c)} {f}s" for f, c in facet_table["counts"].items())
+           + f", {len(facet_bytes):,}B")
+
+    cards = renderer.cards()
+    extra = {index_url: index_bytes, facets_url: facet_bytes}
+    if shard:
+        inline, shards = shard_cards(cards)
+        extra.update(shards)
+        p_info(f"🧱 Sharded: {len(inline)} cards inline, {len(cards) - len(inline)} in {len(shards)} shard(s)")
+    else:
+        inline, shards = cards, {}
+
+    base_start, base_end = load_page_shell(search_index_url=index_url,
+                                           shard_urls=list(shards), total_cards=len(cards),
+                                           facet_chips=render_facet_chips(facet_table, facets_url))
+    page = base_start + "".join(inline) + base_end
+    p_info(f"🧩 {renderer.rendered} cards rendered, {renderer.reused} reused")
+
+    with METRICS.stage("assets"):
+        files, manifest = assets.build(page, extra=extra)
+        files[MANIFEST_FILE] = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        files[HEADERS_FILE] = assets.render_headers_file(manifest).encode("utf-8")
+
+    with METRICS.stage("write"):
+        changed = assets.write_outputs(SITE_DIR, files)
+    if not changed:
+        p_info(f"✅ No changes → {SITE_DIR}/")
+        return False
+
+    for path, entry in sorted(manifest.items()):
+        variants = ", ".join(f"{enc} {len(files[path + sfx]):,}B" for enc, sfx in entry["encodings"].items())
+        p_blue(f"📦 {path} — {entry['bytes']:,}B" + (f" ({variants})" if variants else ""))
+    p_mag(f"🎉 Index generated → {index_path}")
+    return True
 
-        tasks = [asyncio.create_task(guarded(r)) for r in filtered]
+# =================================================
+# REST ENGINE — streaming pipeline
+#   listing pages → [queue] → N repo workers → [queue] → card renderer
+# =================================================
+PIPELINE_QUEUE_SIZE = 200  # backpressure: listing can't run far ahead of the workers
+
+async def stream_repos_rest(session, renderer: CardRenderer):
+    workers = CONCURRENT_CONNECTIONS
+    todo: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    done: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    async def produce():
+        try:
+            async for page in iter_repo_pages(session):
+                for repo in page:
+                    await todo.put(repo)
+        finally:
+            for _ in range(workers):
+                await todo.put(None)
+
+    async def work():
+        try:
+            while (repo := await todo.get()) is not None:
+                try:
+                    await done.put(await process_repo(session, repo))
+                except Exception as e:
+                    p_err(f"❌ Error in repo task {repo.get('name')}: {e}")
+                    LISTING["complete"] = False  # its cached rows must survive this build
+        finally:
+            await done.put(None)
+
+    async def render():
+        finished = 0
+        while finished < workers:
+            repo = await done.get()
+            if repo is None:
+                finished += 1
+            else:
+                renderer.add(repo)
+
+    p_info(f"🧮 Processing repos as pages arrive (parallel {workers})")
+    await asyncio.gather(produce(), *(work() for _ in range(workers)), render())
+    p_info(f"♻️ {REPO_STATS['fresh']} unchanged (cached) / {REPO_STATS['refetched']} refetched")
 
-        completed = []
-        for t in asyncio.as_completed(tasks):
-            try:
-                completed.append(await t)
-            except Exception as e:
-                p_err(f"❌ Error in repo task: {e}")
-                
-        completed.sort(key=lambda x: x["name"].lower())
+# =================================================
+# MAIN ASYNC RUNNER
+# =================================================
+def write_report(engine: str, changed: Optional[bool], report_path: str, profiler=None):
+    """Machine-readable run report: requests, repos, stages, rate-limit sleeps, cache ratio."""
+    report = METRICS.report(
+        engine=engine,
+        changed=changed,
+        rate_limit={
+            "slept_s": round(CORE_LIMITER.slept + GRAPHQL_LIMITER.slept, 3),
+            "paced_s": round(CORE_LIMITER.paced + GRAPHQL_LIMITER.paced, 3),    # token-bucket spacing
+            "paused_s": round(CORE_LIMITER.paused + GRAPHQL_LIMITER.paused, 3),  # waiting out rate limits
+            "pauses": CORE_LIMITER.pauses + GRAPHQL_LIMITER.pauses,
+        },
+        http_cache={"hits": HTTP_CACHE.hits, "misses": HTTP_CACHE.misses, "ratio": round(HTTP_CACHE.ratio, 4)},
+        freshness=dict(REPO_STATS),
+    )
+    if profiler:
+        report["profile"] = profiler.stop()
+        p_info(f"🔬 Profile → {report['profile']['pstats_file']} "
+               f"(peak memory {report['profile']['peak_memory_bytes'] / 1e6:.1f} MB)")
+        for fn in report["profile"]["top_cumulative"][:5]:
+            p_info(f"   {fn['cumtime_s']:>8.3f}s  {fn['function']}")
 
-        generate_index(completed)
+    try:
+        metrics.write(report, report_path)
+    except OSError as e:
+        p_warn(f"⚠️ Failed writing run report: {e}")
+        return
+
+    latency = report["requests"]["latency"]
+    p_info(f"🧾 Run report → {report_path} ({report['requests']['total']} requests, "
+           f"p90 {latency['p90_ms']:.0f}ms, {report['requests']['retries']} retries, "
+           f"{report['wall_s']:.1f}s wall)")
+
+async def main_async(engine: str = "rest", shard: bool = False, report_path: str = metrics.REPORT_FILE,
+                     profile: bool = False, record_dir: Optional[str] = None) -> Optional[bool]:
+    """Returns True if site/ changed, None if no repos could be fetched."""
+    global RECORDER
+    profiler = metrics.Profiler() if profile else None
+    if profiler:
+        profiler.start()
+    p_mag(f"🚀 START: Building portfolio for {ORG_NAME}")
+    if GITHUB_API != "https://api.github.com":
+        p_warn(f"🔁 API base → {GITHUB_API}")
+    if record_dir:
+        import gh_replay
+        RECORDER = gh_replay.Recorder(record_dir)
+
+    if engine == "graphql" and not github_api.token():
+        p_warn("⚠️ GraphQL API needs a token — falling back to REST")
+        engine = "rest"
+
+    # keep-alive pool: handshake once per connection, not once per request
+    async with make_async_session(timeout=REQUEST_TIMEOUT, limit=CONCURRENT_CONNECTIONS,
+                                  limit_per_host=CONCURRENT_CONNECTIONS) as session:
+
+        renderer = CardRenderer()
+        with METRICS.stage("fetch"):  # includes render_cards — REST renders while fetching
+            if engine == "graphql":
+                for repo in await fetch_repos_graphql(session):
+                    renderer.add(repo)
+            else:
+                await stream_repos_rest(session, renderer)
+
+        if not renderer:
+            p_err("❌ No repos fetched. Aborting.")
+            write_report(engine, None, report_path, profiler)
+            return None
 
+        with METRICS.stage("generate_index"):
+            changed = write_index(renderer, shard)
+
+    with METRICS.stage("save_cache"):
+        save_cache(renderer if LISTING["complete"] else None)
+    if RECORDER:
+        p_good(f"📼 Recorded {len(RECORDER.entries)} responses → {RECORDER.save()}")
+    if CORE_LIMITER.slept or GRAPHQL_LIMITER.slept:
+        p_info(f"⏱ Rate limiter: paced {CORE_LIMITER.paced + GRAPHQL_LIMITER.paced:.1f}s, "
+               f"paused {CORE_LIMITER.paused + GRAPHQL_LIMITER.paused:.1f}s "
+               f"({CORE_LIMITER.pauses + GRAPHQL_LIMITER.pauses} global pauses)")
+    p_info(f"📊 HTTP cache: {HTTP_CACHE.hits} hits (304) / {HTTP_CACHE.misses} misses "
+           f"({HTTP_CACHE.ratio:.0%} hit ratio)")
+    write_report(engine, changed, report_path, profiler)
     p_good("🎯 DONE")
-    
+    return changed
+
 # def main():
 #     print(f"Fetching repos for org: {LBLU}{ORG_NAME}{RES}...")
 #     url = f"https://api.github.com/orgs/{ORG_NAME}/repos?per_page=100"
@@ -354,9 +830,34 @@ async def main_async():
 #     generate_index(repos)
 #     print(f"Generated {LMAG}index.html{RES} in {SITE_DIR}")
 
-if __name__ == "__main__":
+def main(argv=None):
+    """`./portfolio.py build` — same flags as running this file directly."""
+    import argparse
+    parser = argparse.ArgumentParser(prog="portfolio.py build", description=f"Build the {ORG_NAME} portfolio page")
+    parser.add_argument("--engine", choices=["rest", "graphql"], default="rest",
+                        help="rest: per-repo fan-out (default) | graphql: 100 repos per query")
+    parser.add_argument("--exit-code", action="store_true",
+                        help=f"exit {EXIT_UNCHANGED} when site/ is byte-identical to the last build (skip deploy)")
+    parser.add_argument("--shard", action="store_true",
+                        help=f"inline the first {SHARD_FIRST_SCREEN} cards, lazy-load the rest as "
+                             f"{SHARD_SIZE}-card JSON shards on scroll (large orgs)")
+    parser.add_argument("--report", default=metrics.REPORT_FILE, metavar="PATH",
+                        help="where to write the JSON run report (default: %(default)s)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"run under cProfile + tracemalloc (pstats → {os.path.basename(metrics.PROFILE_FILE)}, "
+                             "summary in the report)")
+    parser.add_argument("--record", metavar="DIR",
+                        help="save every API response to DIR/cassette.json for gh_replay.py")
+    args = parser.parse_args(argv)
     try:
-        asyncio.run(main_async())
+        changed = asyncio.run(main_async(args.engine, args.shard, args.report, args.profile, args.record))
     except KeyboardInterrupt:
         p_err("Interrupted by user.")
-        
\ No newline at end of file
+        exit(130)
+    if changed is None:
+        exit(EXIT_FAILED)
+    if args.exit_code and not changed:
+        exit(EXIT_UNCHANGED)
+
+if __name__ == "__main__":
+    main()
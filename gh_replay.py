@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# gh_replay.py — record GitHub API responses, serve them back offline
+#
+#   record:  ./generate_portfolio_page.py --record fixtures/      (live API → fixtures/cassette.json)
+#   replay:  ./gh_replay.py fixtures/ --latency-ms 40 --error-rate 0.02 --rate-limit-every 200
+#            GITHUB_API_URL=http://127.0.0.1:8765 ./generate_portfolio_page.py
+
+import os, json, time, random, asyncio, hashlib
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from aiohttp import web
+from multidict import CIMultiDict
+
+from config import GITHUB_API, LCYN, LGRE, LYEL, LMAG, RES
+
+CASSETTE_FILE = "cassette.json"
+CASSETTE_VERSION = 1
+DEFAULT_PORT = 8765
+DEFAULT_PER_PAGE = 30  # GitHub's default when ?per_page is absent
+
+# what fetch_json / the rate limiter / pagination actually read (GitHub sends some lowercase)
+RECORDED_HEADERS = ("content-type", "etag", "last-modified", "link", "retry-after")
+RECORDED_PREFIXES = ("x-ratelimit-",)
+
+
+def keep_header(name: str) -> bool:
+    name = name.lower()
+    return name in RECORDED_HEADERS or name.startswith(RECORDED_PREFIXES)
+
+
+def body_key(body: Optional[bytes]) -> str:
+    """Stable key for a request body (GraphQL query + variables), "" for none."""
+    if not body:
+        return ""
+    try:
+        canonical = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        canonical = body
+    return hashlib.sha256(canonical).hexdigest()[:16]
+
+
+def request_key(method: str, path_qs: str, bkey: str = "") -> str:
+    return f"{method} {path_qs} {bkey}".rstrip()
+
+
+def split_paging(path_qs: str) -> Tuple[str, Dict[str, str], int, Optional[int]]:
+    """/orgs/x/repos?per_page=100&page=2 → ("/orgs/x/repos", {other params}, 2, 100)"""
+    parts = urlsplit(path_qs)
+    params = dict(parse_qsl(parts.query))
+    page = int(params.pop("page", 1) or 1)
+    per_page = params.pop("per_page", None)
+    return parts.path, params, page, int(per_page) if per_page else None
+
+
+# =================================================
+# RECORD
+# =================================================
+class Recorder:
+    """
+    Collects what the generator saw, keyed by method + path?query (+ body
+    hash for POSTs). A later response for the same key replaces the earlier
+    one, so a 403 followed by a successful retry records the success.
+    """
+
+    def __init__(self, directory: str, base: str = GITHUB_API):
+        self.directory = directory
+        self.base = base
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, method: str, url: str, request_body: Optional[bytes], status: int,
+               headers, body: bytes):
+        if url.startswith(self.base):
+            path_qs = url[len(self.base):]
+        else:
+            parts = urlsplit(url)
+            path_qs = parts.path + (f"?{parts.query}" if parts.query else "")
+        bkey = body_key(request_body)
+        self.entries[request_key(method, path_qs, bkey)] = {
+            "method": method,
+            "path": path_qs,
+            "body_key": bkey,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if keep_header(k)},
+            "body": body.decode("utf-8", errors="replace"),
+        }
+
+    def save(self) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, CASSETTE_FILE)
+        cassette = {
+            "v": CASSETTE_VERSION,
+            "base": self.base,
+            "recorded_at": time.time(),
+            "entries": [self.entries[k] for k in sorted(self.entries)],
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cassette, f, indent=1)
+        os.replace(tmp, path)
+        return path
+
+
+# =================================================
+# REPLAY
+# =================================================
+class ReplayServer:
+    """
+    Serves a cassette back over HTTP. Paged list endpoints are merged at load
+    time and re-paginated per request (any per_page, capped by page_size),
+    with Link rel="next"/"last" rebuilt for this server's origin.
+
+    Fault injection (all seeded, so a run is reproducible):
+      latency_ms / jitter_ms  — delay before every response
+      error_rate              — fraction of requests answered 502
+      rate_limit_every        — every Nth request gets a 403 with
+                                X-RateLimit-Remaining: 0, reset in rate_limit_reset s
+    """
+
+    def __init__(self, cassette: Dict[str, Any], latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, rate_limit_every: int = 0, rate_limit_reset: int = 5,
+                 page_size: int = 0, seed: int = 0):
+        self.base = cassette.get("base", "https://api.github.com")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_reset = rate_limit_reset
+        self.page_size = page_size
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "served": 0, "not_modified": 0, "missing": 0,
+                      "injected_errors": 0, "injected_rate_limits": 0}
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        pages: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for entry in cassette.get("entries", []):
+            self.entries[request_key(entry["method"], entry["path"], entry.get("body_key", ""))] = entry
+            path, params, page, _ = split_paging(entry["path"])
+            paged = any(k == "page" for k, _ in parse_qsl(urlsplit(entry["path"]).query))
+            if entry["method"] == "GET" and entry["status"] == 200 and paged:
+                pages.setdefault(self.list_key(path, params), []).append((page, entry))
+
+        # list endpoint → (every item in page order, headers of the first page)
+        self.lists: Dict[str, Tuple[List[Any], Dict[str, str]]] = {}
+        for key, recorded in pages.items():
+            recorded.sort(key=lambda pe: pe[0])
+            items: List[Any] = []
+            for _, entry in recorded:
+                body = json.loads(entry["body"])
+                if not isinstance(body, list):
+                    break
+                items.extend(body)
+            else:
+                self.lists[key] = (items, recorded[0][1]["headers"])
+
+    @staticmethod
+    def list_key(path: str, params: Dict[str, str]) -> str:
+        return path + ("?" + urlencode(sorted(params.items())) if params else "")
+
+    def response(self, status: int, headers: Dict[str, str], body: str, origin: str) -> web.Response:
+        # recorded Link URLs point at the recorded base; rewrite them to this server
+        headers = CIMultiDict((k, v.replace(self.base, origin) if k.lower() == "link" else v)
+                              for k, v in headers.items())
+        headers.setdefault("Content-Type", "application/json; charset=utf-8")
+        return web.Response(status=status, headers=headers, body=body.encode("utf-8"))
+
+    def paged(self, request: web.Request, origin: str) -> Optional[web.Response]:
+        path, params, page, per_page = split_paging(request.path_qs)
+        found = self.lists.get(self.list_key(path, params))
+        if found is None:
+            return None
+        items, headers = found
+        per_page = per_page or DEFAULT_PER_PAGE
+        if self.page_size:
+            per_page = min(per_page, self.page_size)
+        last = max(1, -(-len(items) // per_page))
+        chunk = items[(page - 1) * per_page: page * per_page]
+
+        def url(p):
+            return f"{origin}{path}?" + urlencode(sorted({**params, "per_page": per_page, "page": p}.items()))
+        links = []
+        if page < last:
+            links.append(f'<{url(page + 1)}>; rel="next"')
+        links.append(f'<{url(last)}>; rel="last"')
+        if page > 1:
+            links.append(f'<{url(1)}>; rel="first"')
+            links.append(f'<{url(page - 1)}>; rel="prev"')
+
+        headers = {k: v for k, v in headers.items() if k.lower() not in ("link", "etag", "last-modified")}
+        headers["Link"] = ", ".join(links)
+        body = json.dumps(chunk)
+        headers["ETag"] = f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:20]}"'
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            self.stats["not_modified"] += 1
+            return self.response(304, headers, "", origin)
+        self.stats["served"] += 1
+        return self.response(200, headers, body, origin)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        origin = f"{request.scheme}://{request.host}"
+        if request.path == "/_replay/stats":
+            return web.json_response(self.stats)
+
+        self.stats["requests"] += 1
+        n = self.stats["requests"]
+        delay = self.latency_ms + (self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        if self.rate_limit_every and n % self.rate_limit_every == 0:
+            self.stats["injected_rate_limits"] += 1
+            return web.json_response({"message": "API rate limit exceeded (injected)"}, status=403, headers={
+                "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) + self.rate_limit_reset),
+            })
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return web.json_response({"message": "Server Error (injected)"}, status=502)
+
+        if request.method == "GET":
+            paged = self.paged(request, origin)
+            if paged is not None:
+                return paged
+
+        body = await request.read()
+        entry = self.entries.get(request_key(request.method, request.path_qs, body_key(body)))
+        if entry is None:
+            self.stats["missing"] += 1
+            return web.json_response({"message": "Not Found (not in cassette)"}, status=404)
+
+        etag = CIMultiDict(entry["headers"]).get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            return self.response(304, entry["headers"], "", origin)
+        self.stats["served"] += 1
+        return self.response(entry["status"], entry["headers"], entry["body"], origin)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+
+def load_cassette(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, CASSETTE_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay recorded GitHub API responses (offline builds / benchmarks)")
+    parser.add_argument("directory", help=f"directory holding {CASSETTE_FILE} (from generate_portfolio_page.py --record)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0, help="fixed delay per response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random delay, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 502")
+    parser.add_argument("--rate-limit-every", type=int, default=0, metavar="N",
+                        help="answer every Nth request with a 403 rate limit")
+    parser.add_argument("--rate-limit-reset", type=int, default=5, metavar="SECONDS",
+                        help="X-RateLimit-Reset offset for injected rate limits")
+    parser.add_argument("--page-size", type=int, default=0,
+                        help="cap per_page on list endpoints (forces extra pages)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        cassette = load_cassette(args.directory)
+    except (OSError, ValueError) as e:
+        print(f"{LYEL}❌ Can't load cassette from {args.directory}: {e}{RES}")
+        exit(1)
+
+    server = ReplayServer(cassette, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, rate_limit_every=args.rate_limit_every,
+                          rate_limit_reset=args.rate_limit_reset, page_size=args.page_size, seed=args.seed)
+    print(f"{LGRE}📼 {len(cassette.get('entries', []))} recorded responses, "
+          f"{len(server.lists)} paged list endpoint(s){RES}")
+    print(f"{LMAG}▶ export GITHUB_API_URL=http://{args.host}:{args.port}{RES}")
+    print(f"{LCYN}📊 stats: http://{args.host}:{args.port}/_replay/stats{RES}")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# github_api.py — token, headers and the sync session, built on first use
+#
+# Nothing here runs at import time: the token file is read, and the
+# keep-alive pool opened, only when a command actually talks to GitHub.
+
+import os, threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+from config import GITHUB_API, TOKEN_FILE, LGRE, LYEL, LRED, RES
+
+ACCEPT = "application/vnd.github.mercy-preview+json"  # includes topics in repo payloads
+
+_thread_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def token() -> Optional[str]:
+    """TOKEN_FILE first, then $GITHUB_TOKEN. Read once."""
+    if os.path.isfile(TOKEN_FILE) and os.stat(TOKEN_FILE).st_size > 0:
+        with open(TOKEN_FILE, "r", encoding="utf-8") as f:
+            print(f"{LGRE}🔐 Loaded GitHub token from file: {TOKEN_FILE}{RES}")
+            return f.read().strip()
+    print(f"{LYEL}⚠️ TOKEN_FILE missing — using $GITHUB_TOKEN{RES}")
+    return os.getenv("GITHUB_TOKEN") or None
+
+
+def require_token() -> str:
+    value = token()
+    if not value:
+        print(f"{LRED}❌ GitHub token missing or empty: {TOKEN_FILE} (or set $GITHUB_TOKEN){RES}")
+        exit(1)
+    return value
+
+
+@lru_cache(maxsize=None)
+def headers() -> Dict[str, str]:
+    result = {"Accept": ACCEPT}
+    if token():
+        result["Authorization"] = f"token {token()}"
+    return result
+
+
+def session():
+    """
+    Keep-alive pool for the sync commands (push / publish / prune), one per
+    thread: requests.Session isn't documented as thread-safe, so threads
+    calling GitHub in parallel each get their own.
+    """
+    client = getattr(_thread_local, "client", None)
+    if client is None:
+        from transport import make_sync_session
+        require_token()
+        client = _thread_local.client = make_sync_session(headers())
+    return client
+
+
+def url(path: str) -> str:
+    return f"{GITHUB_API}{path}"
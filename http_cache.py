@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# http_cache.py — ETag / Last-Modified conditional requests for GitHub API GETs
+
+from typing import Any, Dict, Optional
+
+from cache_store import CacheStore
+
+
+class HttpCache:
+    """
+    Per-URL validators (ETag / Last-Modified) plus the last 200 body and its
+    Link header, kept in the CacheStore `http` table. A 304 from GitHub
+    doesn't count against the primary rate limit, so replaying the stored
+    body on 304 makes unchanged rebuilds almost free.
+    """
+
+    def __init__(self, store: CacheStore):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        entry = self.store.get_http(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored entry (body + Link header) for url — call on a 304."""
+        entry = self.store.get_http(url)
+        if entry is None:
+            return None
+        self.hits += 1
+        return entry
+
+    def store_response(self, url: str, headers, body: Any):
+        """Remember a 200 response; only worth keeping if it has a validator."""
+        self.misses += 1
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag or last_modified:
+            self.store.put_http(url, etag, last_modified, body, link=headers.get("Link"))
+
+    @property
+    def ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
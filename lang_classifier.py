@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# lang_classifier.py — file → language rules shared by the push scripts and the site generator
+#
+# DEFAULT_LANG_MAP and the Docker / Terraform / Ansible / Kubernetes rules
+# are compiled once into dict / frozenset lookups: a file costs one suffix
+# lookup, and YAML placement is decided per directory (cached) by matching
+# whole path components, so "deploy/" counts but "redeployment/" doesn't.
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import DEFAULT_LANG_MAP
+
+# =================================================
+# PUSH SIDE: every file in a local repo
+# =================================================
+SUFFIX_LANGS: Dict[str, str] = {ext.lower(): lang for ext, lang in DEFAULT_LANG_MAP.items()}
+NAME_LANGS: Dict[str, str] = {"Dockerfile": "Docker"}
+LOWER_NAME_LANGS: Dict[str, str] = {"docker-compose.yml": "Docker", "docker-compose.yaml": "Docker"}
+YAML_SUFFIXES = frozenset({"yml", "yaml"})
+# first match wins; a YAML file anywhere under one of these directories
+YAML_DIR_LANGS: Tuple[Tuple[str, frozenset], ...] = (
+    ("Ansible", frozenset({"roles", "tasks", "molecule"})),
+    ("Kubernetes", frozenset({"k8s", "manifests", "deploy", "charts", "helm"})),
+)
+
+Classification = Tuple[Optional[str], Optional[str]]  # (language, .gitattributes pattern)
+
+
+def attribute_order(line: str):
+    """Directory-scoped patterns after the plain *.ext ones — in .gitattributes the last match wins."""
+    return line.startswith("**/"), line
+
+
+@lru_cache(maxsize=4096)
+def yaml_language(rel_dir: str) -> Tuple[str, Optional[str]]:
+    """(language, the directory name that decided it) for YAML files under rel_dir."""
+    parts = rel_dir.split("/") if rel_dir else []
+    for lang, dirs in YAML_DIR_LANGS:
+        for part in parts:
+            if part in dirs:
+                return lang, part
+    return "YAML", None
+
+
+def classify(name: str, rel_dir: str = "") -> Classification:
+    """Language + gitattributes pattern for one file, or (None, None) if it isn't counted."""
+    lang = NAME_LANGS.get(name) or LOWER_NAME_LANGS.get(name.lower())
+    if lang:
+        return lang, name
+    _, dot, ext = name.rpartition(".")
+    ext = ext.lower()
+    if not dot or not ext:
+        return None, None
+    if ext in YAML_SUFFIXES:
+        lang, part = yaml_language(rel_dir)
+        return lang, (f"**/{part}/**/*.{ext}" if part else f"*.{ext}")
+    return SUFFIX_LANGS.get(ext) or ext.capitalize(), f"*.{ext}"
+
+
+def classify_dir(rel_dir: str, names: Iterable[str]) -> List[Classification]:
+    """Every file of one directory in one call (what the scanner hands over)."""
+    return [classify(name, rel_dir) for name in names]
+
+
+# =================================================
+# SITE SIDE: badges from a repo's name + top-level entries
+# =================================================
+EXTRA_BY_ENTRY: Dict[str, str] = {"dockerfile": "Dockerfile", "ansible.cfg": "Ansible", "helm": "Kubernetes"}
+EXTRA_BY_SUFFIX: Dict[str, str] = {"tf": "Terraform", "yml": "YAML", "yaml": "YAML"}
+EXTRA_BY_REPO_NAME: Tuple[Tuple[str, str], ...] = (
+    ("docker", "Dockerfile"), ("terraform", "Terraform"), ("ansible", "Ansible"), ("k8s", "Kubernetes"),
+)
+
+
+def extra_languages(repo_name: str, entries: Iterable[str]) -> List[str]:
+    """Languages GitHub's linguist misses, from the repo name and its (lowercased) top-level entries."""
+    name = repo_name.lower()
+    extras = {lang for word, lang in EXTRA_BY_REPO_NAME if word in name}
+    for entry in entries:
+        lang = EXTRA_BY_ENTRY.get(entry)
+        if lang is None:
+            _, dot, ext = entry.rpartition(".")
+            lang = EXTRA_BY_SUFFIX.get(ext) if dot else None
+        if lang:
+            extras.add(lang)
+    return sorted(extras)  # stable order → stable card hashes
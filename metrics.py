@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# metrics.py — per-request / per-stage instrumentation and the JSON run report
+
+import os, re, json, time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config import SCRIPT_DIR
+
+REPORT_FILE = os.path.join(SCRIPT_DIR, ".build_report.json")
+PROFILE_FILE = os.path.join(SCRIPT_DIR, ".build_profile.prof")
+REPORT_VERSION = 1
+SLOWEST_N = 10
+
+# /repos/<owner>/<name>/languages → /repos/{repo}/languages, so endpoints group
+REPO_PATH_RE = re.compile(r"^/repos/[^/]+/[^/]+")
+
+
+def endpoint(url: str) -> str:
+    return REPO_PATH_RE.sub("/repos/{repo}", urlsplit(url).path)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 1),
+        "p90_ms": round(percentile(values, 90) * 1000, 1),
+        "p99_ms": round(percentile(values, 99) * 1000, 1),
+        "max_ms": round(max(values, default=0.0) * 1000, 1),
+        "total_s": round(sum(values), 3),
+    }
+
+
+class BuildMetrics:
+    """
+    Collects one record per HTTP response (or transport error), per-repo
+    processing time and per-stage wall time. Cheap enough to leave on:
+    appends to lists, no I/O until write().
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests: List[Dict[str, Any]] = []
+        self.repos: List[Dict[str, Any]] = []
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def request(self, method: str, url: str, status: Optional[int], nbytes: int,
+                seconds: float, attempt: int = 1, error: Optional[str] = None):
+        self.requests.append({
+            "method": method, "url": url, "endpoint": endpoint(url), "status": status,
+            "bytes": nbytes, "seconds": seconds, "attempt": attempt, "error": error,
+        })
+
+    def repo(self, name: str, seconds: float, fresh: bool):
+        self.repos.append({"name": name, "seconds": seconds, "fresh": fresh})
+
+    @contextmanager
+    def stage(self, name: str):
+        """Wall time of a block; repeated use of the same name accumulates."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += time.perf_counter() - started
+            entry["calls"] += 1
+
+    def report(self, **extra) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        by_endpoint: Dict[str, List[float]] = {}
+        for r in self.requests:
+            key = str(r["status"]) if r["status"] is not None else (r["error"] or "error")
+            by_status[key] = by_status.get(key, 0) + 1
+            by_endpoint.setdefault(f"{r['method']} {r['endpoint']}", []).append(r["seconds"])
+
+        slowest = sorted(self.requests, key=lambda r: r["seconds"], reverse=True)[:SLOWEST_N]
+        repo_times = [r["seconds"] for r in self.repos]
+
+        return {
+            "v": REPORT_VERSION,
+            "started": self.started,
+            "wall_s": round(time.time() - self.started, 3),
+            "stages": {name: {"seconds": round(s["seconds"], 3), "calls": s["calls"]}
+                       for name, s in self.stages.items()},
+            "requests": {
+                "total": len(self.requests),
+                "bytes": sum(r["bytes"] for r in self.requests),
+                # attempt = nth try of that URL, counting rate-limited tries as well as errors
+                "retries": sum(1 for r in self.requests if r["attempt"] > 1),
+                "errors": sum(1 for r in self.requests if r["error"]),
+                "by_status": dict(sorted(by_status.items())),
+                "latency": latency_summary([r["seconds"] for r in self.requests]),
+                "by_endpoint": {ep: latency_summary(v) for ep, v in sorted(by_endpoint.items())},
+                "slowest": [{k: (round(v, 4) if k == "seconds" else v) for k, v in r.items()} for r in slowest],
+            },
+            "repos": {
+                "processed": len(self.repos),
+                "fresh": sum(1 for r in self.repos if r["fresh"]),
+                "latency": latency_summary(repo_times),
+            },
+            **extra,
+        }
+
+
+def write(report: Dict[str, Any], path: str = REPORT_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+# =================================================
+# --profile (cProfile + tracemalloc around the whole run)
+# =================================================
+class Profiler:
+    def __init__(self, path: str = PROFILE_FILE, top: int = 15):
+        self.path = path
+        self.top = top
+        self.profile = None
+
+    def start(self):
+        import cProfile, tracemalloc
+        tracemalloc.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stops both, dumps the pstats file and returns a summary for the report."""
+        import pstats, tracemalloc
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        stats = pstats.Stats(self.profile)
+        functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return {
+            "pstats_file": self.path,
+            "peak_memory_bytes": peak,
+            "top_cumulative": [
+                {"function": f"{os.path.basename(file)}:{line}({func})", "calls": nc,
+                 "tottime_s": round(tt, 4), "cumtime_s": round(ct, 4)}
+                for (file, line, func), (cc, nc, tt, ct, _) in functions
+            ],
+            "top_allocations": [
+                {"where": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+                for stat in snapshot.statistics("lineno")[:self.top]
+            ],
+        }
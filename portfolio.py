@@ -0,0 +1,42 @@
+#!/usr/bin/env bash
+'''exec' "$(dirname "$0")/.venv/bin/python" "$0" "$@"
+' '''
+# portfolio.py — one entry point for every portfolio task
+#
+#   ./portfolio.py build   [--engine graphql] [--shard] [--exit-code] ...   generate site/
+#   ./portfolio.py push    [PATH...]                                          clean-history push to the org
+#   ./portfolio.py publish                                                    make private org repos public
+#   ./portfolio.py prune                                                      delete org repos matching local folders
+#
+# Only the chosen command's module is imported, so `push` never loads
+# aiohttp and `build` never opens a requests pool. The token is read on
+# the first API call (github_api.py), not at startup.
+
+import sys, importlib
+
+from config import ORG_NAME
+
+COMMANDS = {
+    # name: (module with main(argv), help)
+    "build":   ("generate_portfolio_page", "generate site/ from the org's repos"),
+    "push":    ("push_portfolio", "push local folders to the org with a clean history"),
+    "publish": ("change_all_reps_public", "make every private org repo public"),
+    "prune":   ("remove_all_reps_org", "delete org repos named like the local folders"),
+}
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="portfolio.py", description=f"{ORG_NAME} portfolio tools")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        # each command parses its own flags; `portfolio.py build -h` shows them
+        commands.add_parser(name, help=help_text, add_help=False)
+    args, rest = parser.parse_known_args(argv)
+
+    module = importlib.import_module(COMMANDS[args.command][0])
+    return module.main(rest)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# push_journal.py — per-repo stage journal for `portfolio.py push --resume`
+#
+# One JSON line per finished stage (history, scan, commit, create, push,
+# topics) with when it started, how long it took and whether it worked.
+# Lines are appended with a single write, so prep processes and push threads
+# can all log to the same file. A normal run starts every repo over; --resume
+# skips the stages already recorded as ok since that repo's last start.
+
+import os, json, time, contextlib
+from typing import Any, Dict, Optional, Set
+
+from config import SCRIPT_DIR
+
+JOURNAL_FILE = os.path.join(SCRIPT_DIR, ".push_journal.jsonl")
+STAGES = ("history", "scan", "commit", "create", "push", "topics")
+LOCAL_STAGES = STAGES[:3]
+
+
+class PushJournal:
+
+    def __init__(self, path: str = JOURNAL_FILE):
+        self.path = path
+
+    def append(self, record: Dict[str, Any]):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def start(self, repo: str):
+        """Forget earlier progress for this repo (a run without --resume)."""
+        self.append({"repo": os.path.abspath(repo), "stage": "start", "at": time.time()})
+
+    def record(self, repo: str, stage: str, status: str, started: float, **detail):
+        self.append({"repo": os.path.abspath(repo), "stage": stage, "status": status, "at": started,
+                     "seconds": round(time.time() - started, 3), **detail})
+
+    @contextlib.contextmanager
+    def stage(self, repo: str, name: str):
+        """
+        Journal one stage. The body may set entry["status"] (anything but "ok"
+        counts as not done) and add details; an exception is logged as failed
+        and re-raised.
+        """
+        started = time.time()
+        entry: Dict[str, Any] = {}
+        try:
+            yield entry
+        except BaseException as e:
+            self.record(repo, name, "failed", started, error=str(e) or type(e).__name__)
+            raise
+        self.record(repo, name, entry.pop("status", "ok"), started, **entry)
+
+    def load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """repo path → stage → its latest record since the repo's last start."""
+        state: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return state
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a killed run
+            stages = state.setdefault(record.get("repo", ""), {})
+            if record.get("stage") == "start":
+                stages.clear()
+            else:
+                stages[record.get("stage")] = record
+        return state
+
+    def compact(self, state: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        """Rewrite the file with only the records load() would still use."""
+        state = self.load() if state is None else state
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for stages in state.values():
+                for record in stages.values():
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.path)
+
+
+def completed(stages: Dict[str, Dict[str, Any]]) -> Set[str]:
+    """Stages recorded ok, up to the first one that isn't (later ones don't count)."""
+    done = set()
+    for stage in STAGES:
+        if stages.get(stage, {}).get("status") != "ok":
+            break
+        done.add(stage)
+    return done
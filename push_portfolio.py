@@ -0,0 +1,451 @@
+#!/usr/bin/env bash
+'''exec' "$(dirname "$0")/.venv/bin/python" "$0" "$@"
+' '''
+# push_portfolio.py — clean-history push of local project folders to the org
+#   ./portfolio.py push             every folder in the current directory
+#   ./portfolio.py push PATH...     just these folders
+
+import io, os, sys, time, shutil, threading, contextlib, subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from config import (ORG_NAME, GITHUB_API, REMOTE_PREFIX, USERNAME, NAME, EMAIL, BRANCH, SCRIPT_DIR,
+                    TOKEN_FILE, EXCLUDE_REPOS, EXCLUDE_PATHS, DEFAULT_LANG_MAP, SITE_DIR,
+                    PUSH_PREP_WORKERS, PUSH_NET_WORKERS, PUSH_FAST_IMPORT,
+                    LRED, LBLU, LCYN, LYEL, LMAG, LGRE, LGRY, RED, MAG, YEL,
+                    GRE, CYN, BLU, WHTE, BLRED, BLYEL, BLGRE, BLMAG, BLBLU,
+                    BLCYN, BYEL, BMAG, BCYN, BWHTE, DGRY, BLNK, CLEAR, RES)
+import github_api
+from repo_scan import scan_repo
+from lang_classifier import attribute_order
+import fast_commit
+from push_journal import PushJournal, JOURNAL_FILE, STAGES, completed
+
+
+@lru_cache(maxsize=None)
+def has_git_lfs():
+    """Checked once, the first time a push needs it."""
+    found = shutil.which("git-lfs") is not None
+    if not found:
+        print("⚠️ git-lfs not installed. Large files won't be automatically tracked.")
+    return found
+
+# --- Helper functions ---
+def run(cmd, cwd=None, timeout=None):
+    try:
+        process = subprocess.Popen(cmd, shell=True, cwd=cwd,
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        for line in process.stdout:
+            print(f"{DGRY}{line.rstrip()}{RES}")
+        process.wait(timeout=timeout)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+    except subprocess.TimeoutExpired:
+        print(f"⚠️ Command timed out: {cmd}")
+        process.kill()
+
+def remove_git_history(repo):
+    git_dir = os.path.join(repo, ".git")
+    if os.path.exists(git_dir):
+        subprocess.run(f"rm -rf {git_dir}", shell=True)
+    run("git init", cwd=repo)
+    run(f"git config user.name '{BLCYN}{USERNAME}{RES}'", cwd=repo)
+    run(f"git config user.email '{BLBLU}{EMAIL}{RES}'", cwd=repo)
+    try:
+        subprocess.run(["git", "checkout", "-b", BRANCH], cwd=repo, capture_output=True)
+    except subprocess.CalledProcessError: pass
+
+def add_gitignore(repo):
+    gitignore_path = os.path.join(repo, ".gitignore")
+    existing = set()
+    if os.path.exists(gitignore_path):
+        with open(gitignore_path) as f:
+            existing.update(line.strip().rstrip("/") for line in f if line.strip())
+    new_paths = [p.rstrip("/") for p in EXCLUDE_PATHS if p.rstrip("/") not in existing]
+    if new_paths:
+        with open(gitignore_path, "a") as f:
+            for line in sorted(new_paths):
+                f.write(line + "\n")
+
+# --- Language stats ---
+def calculate_language_stats(index):
+    lang_sizes = {}
+    for f in index.files.values():
+        if f.lang:
+            lang_sizes[f.lang] = lang_sizes.get(f.lang, 0) + f.size
+    total = sum(lang_sizes.values())
+    if total == 0: return {}
+    return {lang: round(size / total * 100, 2) for lang, size in lang_sizes.items()}
+
+# --- Git LFS ---
+LFS_MIN_SIZE = 50*1024*1024        # tracked with LFS above this
+LFS_MAX_SIZE = 2*1024*1024*1024    # GitHub's LFS limit; bigger files are ignored
+
+def lfs_pattern(path):
+    """Exact-path .gitattributes pattern for one file (what `git lfs track` would write)."""
+    for ch in "\\[*?#":
+        path = path.replace(ch, "\\" + ch)
+    return "/" + path.replace(" ", "[[:space:]]")
+
+def plan_git_lfs(repo, index):
+    """Pick LFS files from the scan; ignore anything over 2 GB. Returns the paths to track."""
+    if not has_git_lfs():
+        return []
+
+    lfs_tracked, too_big = [], []
+    for f in index.files.values():
+        # Track files between 50 MB and 2 GB
+        if LFS_MIN_SIZE < f.size <= LFS_MAX_SIZE:
+            lfs_tracked.append(f.path)
+        # Ignore files >2 GB
+        elif f.size > LFS_MAX_SIZE:
+            print(f"⚠️ Skipping file >2GB: {f.path}")
+            too_big.append(f.path)
+
+    if too_big:
+        with open(os.path.join(repo, ".gitignore"), "a") as g:
+            g.writelines(path + "\n" for path in too_big)
+        for path in too_big:
+            del index.files[path]
+        index.add(".gitignore")
+    if lfs_tracked:
+        print(f"🗃️ Tracking {len(lfs_tracked)} large file(s) with Git LFS")
+    index.lfs = set(lfs_tracked)
+    return sorted(lfs_tracked)
+
+# --- Add gitattributes with LFS, Docker Compose, Ansible, Kubernetes ---
+def add_gitattributes(repo, index, lfs_tracked=()):
+    """One write: LFS filters for the large files, then the linguist overrides."""
+    gitattributes_path = os.path.join(repo, ".gitattributes")
+    lines = {f"{f.pattern} linguist-language={f.lang} linguist-vendored=false"
+             for f in index.files.values() if f.lang}
+    with open(gitattributes_path, "w") as f:
+        for path in lfs_tracked:
+            f.write(f"{lfs_pattern(path)} filter=lfs diff=lfs merge=lfs -text\n")
+        for line in sorted(lines, key=attribute_order):
+            f.write(line + "\n")
+    index.add(".gitattributes")
+
+def ensure_empty_dirs(repo, index):
+    for d in index.empty_dirs:
+        keep_file = os.path.join(repo, d, ".gitkeep")
+        if not os.path.exists(keep_file): open(keep_file,"w").close()
+        index.add(f"{d}/.gitkeep")
+
+COMMIT_MESSAGE = "Initial commit with clean history, .gitignore, .gitattributes, LFS"
+
+def initial_commit(repo, repo_name, index, fast_import=PUSH_FAST_IMPORT):
+    readme = os.path.join(repo,"README.md")
+    if not os.path.exists(readme):
+        with open(readme,"w") as f: f.write(f"# {repo_name}\n")
+        index.add("README.md")
+    if fast_import:
+        try:
+            if fast_commit.commit(repo, index, BRANCH, COMMIT_MESSAGE):
+                return
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️ fast-import failed, falling back to git add: {e}")
+    run("git add -A", cwd=repo)
+    run("git add -f .gitattributes", cwd=repo)
+    try:
+        run(f"git commit -m '{COMMIT_MESSAGE}'", cwd=repo)
+    except subprocess.CalledProcessError: pass
+
+def create_github_repo(repo_name):
+    url=f"{GITHUB_API}/repos/{ORG_NAME}/{repo_name}"
+    r=github_api.session().get(url)
+    if r.status_code==404:
+        data={"name":repo_name,"private":True,"default_branch":BRANCH}
+        r2=github_api.session().post(f"{GITHUB_API}/orgs/{ORG_NAME}/repos",json=data)
+        if r2.status_code==201: print(f"✅ Repo {LGRE}{repo_name}{RES} created successfully as private.")
+        else: print(f"❌ Failed to create repo {LGRE}{repo_name}{RES} (HTTP {r2.status_code})"); return False
+    else: print(f"✅ Repo {BLGRE}{repo_name}{RES} already exists on GitHub.")
+    return True
+
+# --- Push safely ---
+def set_remote_and_push(repo, repo_name):
+    """
+    Safely set Git remote and push branch + tags to GitHub.
+    Handles Git LFS, skips files >2GB, and uses timeouts.
+    Returns False if the branch push failed.
+    """
+    remote = f"{REMOTE_PREFIX}/{repo_name}.git"
+
+    # Remove existing origin if present
+    try:
+        result = subprocess.run("git remote", shell=True, capture_output=True, text=True, cwd=repo)
+        if "origin" in result.stdout.split():
+            run("git remote remove origin", cwd=repo)
+    except subprocess.CalledProcessError:
+        pass
+
+    # Add SSH remote
+    run(f"git remote add origin {remote}", cwd=repo)
+    print(f"🔗 Remote set to: {LCYN}{remote}{RES}")
+
+    # Ensure LFS installed
+    if has_git_lfs():
+        run("git lfs install", cwd=repo)
+
+    # Push branch first
+    pushed = True
+    try:
+        run(f"git push -u origin {BRANCH}", cwd=repo, timeout=600)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to push branch {BRANCH}: {e}")
+        pushed = False
+    except subprocess.TimeoutExpired:
+        print(f"⚠️ Push timed out for branch {BRANCH}")
+        pushed = False
+
+    # Push tags separately
+    try:
+        run("git push --tags origin", cwd=repo, timeout=600)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to push tags: {e}")
+    except subprocess.TimeoutExpired:
+        print(f"⚠️ Push timed out for tags")
+
+    if pushed:
+        print(f"✅ Push completed for {repo_name} (branch + tags)")
+    return pushed
+
+def sanitize_topic(t):
+    t = t.lower().strip().replace(" ","-")
+    t = ''.join(c for c in t if c.isalnum() or c=='-')
+    return t.strip("-")[:50]
+
+def add_topics(repo_name, parent_folder):
+    topics=[sanitize_topic(parent_folder)]
+    url=f"{GITHUB_API}/repos/{ORG_NAME}/{repo_name}/topics"
+    resp=github_api.session().put(url,json={"names":topics})
+    if resp.status_code in (200,201): print(f"🏷️ Topics added to {LGRE}{repo_name}{RES}: {topics}")
+    else: print(f"❌ Failed to add topics to {LGRE}{repo_name}{RES}: HTTP {resp.status_code}, {resp.text}"); return False
+    return True
+
+# --- Per-repo output ---
+class RepoOutput(io.TextIOBase):
+    """
+    Stand-in for sys.stdout while repos are pushed in parallel: a thread that
+    has claimed a buffer writes there, everyone else goes straight through.
+    Each repo's log is printed in one piece when it finishes.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def claim(self):
+        self.local.buffer = io.StringIO()
+
+    def release(self):
+        buffer, self.local.buffer = self.local.buffer, None
+        return buffer.getvalue()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def repo_name_of(repo):
+    return os.path.basename(os.path.abspath(repo))
+
+def print_language_stats(stats):
+    if stats:
+        print(f"📊 {CYN}Estimated language percentages{RES}:")
+        for lang, pct in sorted(stats.items(), key=lambda x: x[1], reverse=True):
+            print(f"   {YEL}{lang}{RES}: {MAG}{pct}{WHTE}%{RES}")
+    else:
+        print(f"📊 {LRED}No recognizable language files found{RES}.")
+
+# --- Stages ---
+def prepare_repo(repo, fast_import=PUSH_FAST_IMPORT, journal=None, done=frozenset(), lfs=()):
+    """
+    Local half, run in a worker process: history reset, ignore/attributes/LFS,
+    initial commit, language stats. Disk and CPU only — no network.
+    Stages in `done` (from the journal on --resume) are skipped.
+    """
+    journal = journal or PushJournal()
+    repo_name = repo_name_of(repo)
+    result = {"repo": repo, "name": repo_name, "status": "prepared", "prep_s": 0.0, "push_s": 0.0}
+    started = time.perf_counter()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        print(f"📦 Processing {BLGRE}{repo_name}{RES} (path: {repo})")
+        resumed_at = next((s for s in STAGES if s not in done), None)
+        if done:
+            print(f"⏩ Resuming at stage: {BLCYN}{resumed_at}{RES}")
+        try:
+            if "history" not in done:
+                with journal.stage(repo, "history"):
+                    remove_git_history(repo)     # clean history
+            index = None
+            if "scan" not in done:
+                with journal.stage(repo, "scan") as entry:
+                    add_gitignore(repo)          # ignore unwanted paths
+                    index = scan_repo(repo)      # one pass over the tree, read by every step below
+                    lfs = plan_git_lfs(repo, index)  # large files from the same scan, no git calls
+                    add_gitattributes(repo, index, lfs)  # LFS + linguist attributes in one write
+                    ensure_empty_dirs(repo, index)  # keep empty dirs
+                    entry.update(files=len(index.files), lfs=lfs)
+            if "commit" not in done:
+                with journal.stage(repo, "commit"):
+                    if index is None:
+                        # scan's files are already on disk; re-read them (no writes)
+                        index = scan_repo(repo)
+                        index.lfs = set(lfs)
+                    initial_commit(repo, repo_name, index, fast_import)  # commit everything
+            if index is not None:
+                print_language_stats(calculate_language_stats(index))
+        except Exception as e:
+            print(f"❌ Preparing {repo_name} failed: {e}")
+            result["status"] = "prep failed"
+    result["prep_s"] = time.perf_counter() - started
+    result["log"] = out.getvalue()
+    return result
+
+def upload_repo(prepared, output, journal=None, done=frozenset()):
+    """Network half, run in a worker thread: create the GitHub repo, push, set topics."""
+    journal = journal or PushJournal()
+    result = dict(prepared)
+    repo, repo_name = result["repo"], result["name"]
+    started = time.perf_counter()
+    output.claim()
+    try:
+        steps = (
+            ("create", "create failed", lambda: create_github_repo(repo_name)),
+            ("push", "push failed", lambda: set_remote_and_push(repo, repo_name)),
+            ("topics", "topics failed",
+             lambda: add_topics(repo_name, os.path.basename(os.path.dirname(os.path.abspath(repo))))),
+        )
+        result["status"] = "pushed"
+        for stage, failed, step in steps:
+            if stage in done:
+                continue
+            with journal.stage(repo, stage) as entry:
+                ok = step()
+                if not ok:
+                    entry["status"] = "failed"
+            if not ok:
+                result["status"] = failed
+                break
+    except Exception as e:
+        print(f"❌ Pushing {repo_name} failed: {e}")
+        result["status"] = "push failed"
+    finally:
+        result["log"] += output.release()
+    result["push_s"] = time.perf_counter() - started
+    return result
+
+# --- Main Loop ---
+def push_repos(repos, prep_workers=PUSH_PREP_WORKERS, net_workers=PUSH_NET_WORKERS,
+               fast_import=PUSH_FAST_IMPORT, resume=False, journal=None):
+    """
+    Two bounded pools: prep_workers processes for the local stages, and
+    net_workers threads for the GitHub calls and git push. A repo moves to
+    the network pool as soon as its prep finishes, so pushes of early repos
+    overlap with prep of later ones. Every stage is written to the journal;
+    with resume=True each repo picks up at its first stage not recorded ok.
+    Returns one result dict per repo.
+    """
+    journal = journal or PushJournal()
+    state = journal.load()
+    journal.compact(state)
+    results = []
+    todo = []
+    for repo in repos:
+        repo_name = repo_name_of(repo)
+        if not os.path.isdir(repo):
+            print(f"❌ Not a directory: {repo}")
+            results.append({"repo": repo, "name": repo_name, "status": "not found", "prep_s": 0.0, "push_s": 0.0})
+        elif repo_name in EXCLUDE_REPOS or 'practice' in repo_name:
+            print(f"⏭ Skipping {repo_name}")
+            results.append({"repo": repo, "name": repo_name, "status": "skipped", "prep_s": 0.0, "push_s": 0.0})
+        elif not resume:
+            journal.start(repo)
+            todo.append((repo, frozenset(), ()))
+        else:
+            stages = state.get(os.path.abspath(repo), {})
+            done = completed(stages)
+            if done == set(STAGES):
+                print(f"✅ {repo_name} already pushed (journal)")
+                results.append({"repo": repo, "name": repo_name, "status": "already pushed", "prep_s": 0.0, "push_s": 0.0})
+            else:
+                todo.append((repo, frozenset(done), tuple(stages.get("scan", {}).get("lfs", ()))))
+    if not todo:
+        return results
+
+    has_git_lfs()  # warn once here rather than in every repo's log
+    output = RepoOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, min(prep_workers, len(todo)))) as prep_pool, \
+             ThreadPoolExecutor(max_workers=max(1, net_workers)) as net_pool:
+            done_by_repo = {repo: done for repo, done, _ in todo}
+            pending = {prep_pool.submit(prepare_repo, repo, fast_import, journal, done, lfs)
+                       for repo, done, lfs in todo}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    if result["status"] == "prepared":
+                        pending.add(net_pool.submit(upload_repo, result, output, journal,
+                                                    done_by_repo[result["repo"]]))
+                        continue
+                    print(result["log"], end="", flush=True)
+                    results.append(result)
+    finally:
+        sys.stdout = output.stream
+    return results
+
+OK_STATUSES = ("pushed", "already pushed")
+
+def print_summary(results):
+    if not results:
+        return
+    icons = {"pushed": "✅", "already pushed": "✅", "skipped": "⏭"}
+    width = max(len(r["name"]) for r in results)
+    print(f"\n📋 {BLCYN}Summary{RES}")
+    print(f"   {'repo':<{width}}  {'prep':>7}  {'push':>7}  result")
+    for r in sorted(results, key=lambda r: r["name"].lower()):
+        color = LGRE if r["status"] in OK_STATUSES else LGRY if r["status"] == "skipped" else LRED
+        print(f"   {r['name']:<{width}}  {r['prep_s']:>6.1f}s  {r['push_s']:>6.1f}s  "
+              f"{icons.get(r['status'], '❌')} {color}{r['status']}{RES}")
+    pushed = sum(r["status"] in OK_STATUSES for r in results)
+    print(f"   {pushed}/{len(results)} pushed")
+
+def local_repos(base_dir):
+    return [d for d in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, d))]
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="portfolio.py push",
+                                     description=f"Push local folders to {ORG_NAME} with a clean history")
+    parser.add_argument("repos", nargs="*", metavar="PATH",
+                        help="folders to push (default: every folder in the current directory)")
+    parser.add_argument("-j", "--jobs", type=int, default=PUSH_PREP_WORKERS, metavar="N",
+                        help=f"repos prepared at once, one process each (default {PUSH_PREP_WORKERS})")
+    parser.add_argument("--push-jobs", type=int, default=PUSH_NET_WORKERS, metavar="N",
+                        help=f"repos created/pushed at once (default {PUSH_NET_WORKERS})")
+    parser.add_argument("--git-add", dest="fast_import", action="store_false", default=PUSH_FAST_IMPORT,
+                        help="build the initial commit with git add -A instead of git fast-import")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"continue each repo from its first unfinished stage in {os.path.basename(JOURNAL_FILE)}")
+    args = parser.parse_args(argv)
+
+    github_api.require_token()
+    results = push_repos(args.repos or local_repos(os.getcwd()), args.jobs, args.push_jobs, args.fast_import,
+                         resume=args.resume)
+    print_summary(results)
+    print(f"🎉 {BLYEL}All repos processed.{RES}")
+    # folders named on the command line must all be pushed; a scan of the cwd may skip some
+    allowed = OK_STATUSES if args.repos else OK_STATUSES + ("skipped",)
+    failed = [r for r in results if r["status"] not in allowed]
+    if failed:
+        if any(r["status"] not in ("skipped", "not found") for r in failed):
+            print(f"📒 Stage journal: {JOURNAL_FILE} — rerun with {BLCYN}--resume{RES} to continue where it stopped")
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# rate_limiter.py — shared token-bucket scheduler driven by GitHub rate-limit headers
+
+import asyncio, time
+from typing import Mapping, Optional
+
+from config import RATE_LIMIT_RPS, RATE_LIMIT_BURST, RATE_LIMIT_MIN_RPS, RATE_LIMIT_LOW_WATER
+
+SECONDARY_LIMIT_WAIT = 60  # GitHub: wait at least a minute when no Retry-After is given
+# secondary limits can come back as a plain 403 with budget left; only the body says so
+SECONDARY_LIMIT_MESSAGE = b"secondary rate limit"
+
+
+def is_secondary_limit(body: Optional[bytes]) -> bool:
+    return bool(body) and SECONDARY_LIMIT_MESSAGE in body.lower()
+
+
+class RateLimitScheduler:
+    """
+    Every request calls acquire() before it goes out and observe() once the
+    response is back. acquire() paces requests with a token bucket and blocks
+    *all* callers while a global pause is in effect; observe() reads
+    X-RateLimit-* / Retry-After and either slows the bucket down (budget
+    running low) or pauses everyone (budget gone / secondary limit hit).
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT_RPS, burst: int = RATE_LIMIT_BURST,
+                 min_rate: float = RATE_LIMIT_MIN_RPS, low_water: int = RATE_LIMIT_LOW_WATER):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.rate = rate
+        self.burst = burst
+        self.low_water = low_water
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+        self.paused_until = 0.0
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.slept = 0.0     # seconds spent waiting (pacing + pauses)
+        self.paced = 0.0     #   of which token-bucket pacing
+        self.paused = 0.0    #   of which global rate-limit pauses
+        self.pauses = 0      # global pauses triggered
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.last) * self.rate)
+        self.last = now
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # FIFO lock: waiters are released one token at a time, in order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                    self.paused += wait
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                    self.paced += wait
+                self.slept += wait
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> float:
+        until = time.monotonic() + max(0.0, seconds)
+        if until > self.paused_until:
+            self.paused_until = until
+            self.pauses += 1
+        # restart from an empty bucket so the pause isn't followed by a burst
+        self.tokens = 0
+        self.last = self.paused_until
+        return max(0.0, seconds)
+
+    def observe(self, status: int, headers: Mapping[str, str], body: Optional[bytes] = None) -> float:
+        """Feed back a response (body: for 403s). Returns the global pause it triggered (0 if none)."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+        if status in (403, 429):
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                return self.pause(float(retry_after))
+            if self.remaining == 0:
+                return self.pause((self.reset_at or time.time() + 60) - time.time() + 1)
+            if status == 429 or is_secondary_limit(body):
+                return self.pause(SECONDARY_LIMIT_WAIT)
+            return 0.0
+
+        # Near the limit: stretch what's left over the rest of the window
+        if self.remaining is not None and self.reset_at is not None:
+            if self.remaining == 0:
+                return self.pause(self.reset_at - time.time() + 1)
+            if self.remaining < self.low_water:
+                window = max(1.0, self.reset_at - time.time())
+                self.rate = max(self.min_rate, min(self.max_rate, self.remaining / window))
+            else:
+                self.rate = self.max_rate
+        return 0.0
+
+    def is_rate_limited(self, status: int, headers: Mapping[str, str], body: Optional[bytes] = None) -> bool:
+        return status in (403, 429) and (
+            headers.get("Retry-After") is not None
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or status == 429
+            or is_secondary_limit(body)
+        )
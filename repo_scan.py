@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# repo_scan.py — one os.scandir pass per repo, shared by every push step
+#
+# The LFS, gitattributes, language-stats and empty-dir steps each used to
+# walk the whole tree with an exists() + stat() per file (and a listdir()
+# per directory). They now all read the RepoIndex built here: DirEntry
+# gives the type for free, so a file costs one stat and a directory one
+# scandir. Ignored paths (git's global excludes file and info/exclude,
+# EXCLUDE_PATHS, the repo's .gitignore files — honouring core.ignorecase)
+# are pruned on the way down, so node_modules/ or .venv/ are never entered
+# and the index holds what `git add -A` would commit.
+
+import os, re, stat, subprocess
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Sequence, Set, Tuple
+
+from config import EXCLUDE_PATHS
+from lang_classifier import classify, classify_dir
+
+
+class FileEntry(NamedTuple):
+    path: str               # relative to the repo, "/"-separated
+    size: int               # bytes
+    lang: Optional[str]     # None when the file isn't counted (no extension)
+    pattern: Optional[str]  # .gitattributes pattern the language is declared under
+    mode: str = "100644"    # git file mode: 100644, 100755 or 120000 (symlink)
+    link: Optional[str] = None  # symlink target, committed as the blob
+
+
+def git_mode(st: os.stat_result) -> str:
+    # core.fileMode is off on Windows, so git never records the exec bit there
+    return "100755" if os.name != "nt" and st.st_mode & stat.S_IXUSR else "100644"
+
+
+# =================================================
+# IGNORE RULES (gitignore syntax)
+# =================================================
+class IgnoreRule(NamedTuple):
+    regex: Pattern
+    negate: bool      # "!pattern" re-includes
+    dir_only: bool    # "pattern/" only matches directories
+    anchored: bool    # contains "/" → matched against the path, else against the name
+
+
+def glob_to_regex(glob: str) -> str:
+    out, i, n = [], 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")  # zero or more directories
+            i += 3
+            continue
+        if glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and glob.find("]", i + 2) != -1:
+            j = glob.find("]", i + 2)
+            body = glob[i + 1:j].replace("\\", "\\\\").replace("[", "\\[")
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body) + "]")
+            i = j + 1
+            continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_rules(lines: Iterable[str], ignorecase: bool = False) -> List[IgnoreRule]:
+    flags = re.DOTALL | (re.IGNORECASE if ignorecase else 0)
+    rules = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "  # "foo\ " keeps its escaped trailing space
+        line = stripped
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        regex = re.compile(glob_to_regex(line.lstrip("/")), flags)
+        rules.append(IgnoreRule(regex, negate, dir_only, anchored))
+    return rules
+
+
+def read_rules(path: str, ignorecase: bool = False) -> List[IgnoreRule]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return parse_rules(f, ignorecase)
+    except OSError:
+        return []
+
+
+def git_ignore_config(repo: str) -> Tuple[str, bool]:
+    """
+    (core.excludesFile, core.ignorecase) as git resolves them for `repo`.
+    An unset excludesFile defaults to $XDG_CONFIG_HOME/git/ignore, or
+    ~/.config/git/ignore; without git, both fall back to the defaults.
+    """
+    config = {}
+    try:
+        out = subprocess.run(["git", "-C", repo, "config", "-z", "--get-regexp", r"^core\.(excludesfile|ignorecase)$"],
+                             capture_output=True, text=True).stdout
+    except OSError:
+        out = ""
+    for item in out.split("\0"):
+        if item:
+            key, _, value = item.partition("\n")
+            config[key.lower()] = value  # the last value wins, as in git
+    excludes_file = config.get("core.excludesfile")
+    if excludes_file:
+        excludes_file = os.path.join(repo, os.path.expanduser(excludes_file))  # relative → worktree root
+    else:
+        xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        excludes_file = os.path.join(xdg, "git", "ignore")
+    ignorecase = config.get("core.ignorecase", "false").lower() in ("", "true", "yes", "on", "1")
+    return excludes_file, ignorecase
+
+
+class IgnoreMatcher:
+    """
+    Ignore rules in effect for one directory, lowest precedence first: the
+    global excludes file, .git/info/exclude, EXCLUDE_PATHS, then each
+    .gitignore from the repo root down. Like git, the last matching rule
+    wins and deeper .gitignore files override shallower ones.
+    """
+
+    def __init__(self, layers: Sequence[Tuple[str, List[IgnoreRule]]] = (), ignorecase: bool = False):
+        self.layers = tuple(layers)  # (directory the rules are relative to, rules)
+        self.ignorecase = ignorecase  # core.ignorecase: patterns match regardless of case
+
+    @classmethod
+    def from_excludes(cls, excludes: Iterable[str] = EXCLUDE_PATHS, ignorecase: bool = False) -> "IgnoreMatcher":
+        return cls([("", parse_rules(excludes, ignorecase))], ignorecase)
+
+    @classmethod
+    def for_repo(cls, repo: str, excludes: Iterable[str] = EXCLUDE_PATHS) -> "IgnoreMatcher":
+        """git's own exclude sources for `repo` under `excludes`; .gitignore files are added during the scan."""
+        excludes_file, ignorecase = git_ignore_config(repo)
+        layers = [("", read_rules(path, ignorecase))
+                  for path in (excludes_file, os.path.join(repo, ".git", "info", "exclude"))]
+        layers.append(("", parse_rules(excludes, ignorecase)))
+        return cls([layer for layer in layers if layer[1]], ignorecase)
+
+    def with_gitignore(self, repo: str, rel_dir: str) -> "IgnoreMatcher":
+        rules = read_rules(os.path.join(repo, rel_dir, ".gitignore"), self.ignorecase)
+        return IgnoreMatcher(self.layers + ((rel_dir, rules),), self.ignorecase) if rules else self
+
+    def ignored(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        for base, rules in reversed(self.layers):
+            target = rel_path[len(base) + 1:] if base else rel_path
+            for rule in reversed(rules):
+                if rule.dir_only and not is_dir:
+                    continue
+                if rule.regex.fullmatch(target if rule.anchored else name):
+                    return not rule.negate
+        return False
+
+
+# =================================================
+# SCAN
+# =================================================
+class RepoIndex:
+    """Every committed file under a repo with its size and language, plus the empty directories."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.files: Dict[str, FileEntry] = {}
+        self.empty_dirs: List[str] = []
+        self.embedded: List[str] = []  # subfolders with their own .git (git add records a gitlink)
+        self.lfs: Set[str] = set()     # paths committed as LFS pointers (plan_git_lfs)
+
+    def add(self, rel_path: str) -> Optional[FileEntry]:
+        """(Re)index one file a push step has just written (.gitkeep, README.md, ...)."""
+        try:
+            st = os.stat(os.path.join(self.root, rel_path))
+        except OSError:
+            return None
+        rel_dir, _, name = rel_path.rpartition("/")
+        entry = self.files[rel_path] = FileEntry(rel_path, st.st_size, *classify(name, rel_dir), git_mode(st))
+        return entry
+
+
+def scan_repo(repo: str, excludes: Iterable[str] = EXCLUDE_PATHS) -> RepoIndex:
+    index = RepoIndex(repo)
+    stack = [("", IgnoreMatcher.for_repo(repo, excludes))]
+    while stack:
+        rel_dir, matcher = stack.pop()
+        try:
+            with os.scandir(os.path.join(repo, rel_dir) if rel_dir else repo) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"⚠️ Can't read {rel_dir or repo}: {e}")
+            continue
+        if rel_dir and any(entry.name == ".git" for entry in entries):
+            index.embedded.append(rel_dir)
+            continue
+        if any(entry.name == ".gitignore" for entry in entries):
+            matcher = matcher.with_gitignore(repo, rel_dir)
+
+        names, stats = [], []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if entry.name == ".git" or matcher.ignored(rel, entry.name, is_dir):
+                continue
+            if is_dir:
+                stack.append((rel, matcher))
+                continue
+            if entry.is_symlink():
+                # committed as a link, never followed; counted with its target's size if that's a file
+                link = os.readlink(entry.path)
+                try:
+                    st = entry.stat()
+                except OSError:
+                    st = None
+                    print(f"⚠️ Dangling symlink (committed as a link): {os.path.join(repo, rel)}")
+                if st is not None and stat.S_ISREG(st.st_mode):
+                    lang, pattern = classify(entry.name, rel_dir)
+                    index.files[rel] = FileEntry(rel, st.st_size, lang, pattern, "120000", link)
+                else:
+                    index.files[rel] = FileEntry(rel, 0, None, None, "120000", link)
+                continue
+            stats.append(entry.stat())
+            names.append(entry.name)
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        for name, st, (lang, pattern) in zip(names, stats, classify_dir(rel_dir, names)):
+            index.files[prefix + name] = FileEntry(prefix + name, st.st_size, lang, pattern, git_mode(st))
+        if not entries and rel_dir:
+            index.empty_dirs.append(rel_dir)
+    return index
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# search_index.py — build-time inverted index for the page's search box
+
+import re, json
+from typing import Dict, List, Set
+
+INDEX_VERSION = 1
+
+# keeps c++ / c# / node.js together; must match the split in templates/search.html
+TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+def tokenize(text: str) -> Set[str]:
+    tokens = set()
+    for raw in TOKEN_RE.findall((text or "").lower()):
+        token = raw.strip(".")
+        if token:
+            tokens.add(token)
+    return tokens
+
+
+def card_tokens(repo) -> Set[str]:
+    """Everything a visitor might type for this card: name, topics, languages, description."""
+    tokens = tokenize(repo["name"])
+    for topic in repo.get("topics") or []:
+        tokens |= tokenize(topic)
+    for lang in repo.get("languages") or []:
+        tokens |= tokenize(lang)
+    tokens |= tokenize(repo.get("description") or "")
+    return tokens
+
+
+def build_index(cards: List[Set[str]]) -> Dict[str, object]:
+    """
+    cards[i] is the token set of the i-th card on the page (DOM order).
+
+    tokens   — sorted, so the page can binary-search a prefix range
+    postings — card ids per token, delta-encoded (ascending) to stay small
+    """
+    postings: Dict[str, List[int]] = {}
+    for card_id, tokens in enumerate(cards):
+        for token in tokens:
+            postings.setdefault(token, []).append(card_id)
+
+    sorted_tokens = sorted(postings)
+    encoded = []
+    for token in sorted_tokens:
+        ids, prev, deltas = postings[token], 0, []
+        for card_id in ids:
+            deltas.append(card_id - prev)
+            prev = card_id
+        encoded.append(deltas)
+
+    return {"v": INDEX_VERSION, "n": len(cards), "tokens": sorted_tokens, "postings": encoded}
+
+
+def encode(index: Dict[str, object]) -> bytes:
+    return json.dumps(index, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# template_engine.py — precompiled {PLACEHOLDER} templates with HTML escaping
+
+import os, re, html, hashlib
+from functools import lru_cache
+from typing import Any, Mapping
+
+from config import SCRIPT_DIR
+
+TEMPLATE_DIR = os.path.join(SCRIPT_DIR, "templates")
+
+# {ORG_NAME}-style only, so CSS/JS braces pass through untouched
+PLACEHOLDER_RE = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+
+
+class Markup(str):
+    """Already-safe HTML — inserted verbatim instead of being escaped."""
+
+
+def escape(value: Any) -> str:
+    if isinstance(value, Markup):
+        return value
+    return html.escape(str(value), quote=True)
+
+
+class Template:
+    """
+    Source is split once into literal / placeholder segments; render() is a
+    single pass over them. Values are HTML-escaped unless they're Markup.
+    Placeholders with no value are left as-is (same as str.replace).
+    """
+
+    __slots__ = ("literals", "names", "digest")
+
+    def __init__(self, source: str):
+        parts = PLACEHOLDER_RE.split(source)
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+        self.digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def render(self, values: Mapping[str, Any] = None, **kwargs) -> Markup:
+        values = {**(values or {}), **kwargs}
+        out = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            out.append(escape(values[name]) if name in values else "{" + name + "}")
+            out.append(literal)
+        return Markup("".join(out))
+
+
+@lru_cache(maxsize=None)
+def _compile_file(path: str, mtime_ns: int) -> Template:
+    with open(path, "r", encoding="utf-8") as f:
+        return Template(f.read())
+
+
+@lru_cache(maxsize=None)
+def _read_file(path: str, mtime_ns: int) -> Markup:
+    with open(path, "r", encoding="utf-8") as f:
+        return Markup(f.read())
+
+
+def load(name: str, directory: str = TEMPLATE_DIR) -> Template:
+    """Compiled template; parsed once per process (again only if the file changes)."""
+    path = os.path.join(directory, name)
+    return _compile_file(path, os.stat(path).st_mtime_ns)
+
+
+def load_raw(name: str, directory: str = TEMPLATE_DIR) -> Markup:
+    """File contents inserted verbatim (e.g. styles.css)."""
+    path = os.path.join(directory, name)
+    return _read_file(path, os.stat(path).st_mtime_ns)
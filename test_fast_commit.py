@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# test_fast_commit.py — the fast-import commit must hold the tree `git add -A` would
+#
+#   python -m pytest -q test_fast_commit.py
+#
+# The same folder is committed both ways, under a throwaway HOME with a
+# global excludes file, .git/info/exclude and core.ignorecase, and the two
+# tree hashes are compared.
+
+import os, shutil, subprocess
+
+import pytest
+
+import fast_commit
+from repo_scan import scan_repo
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+FILES = {
+    ".gitignore": "*.tmp\n!keep.tmp\nbuild/\n!shared.secret\nCache/\n",
+    "main.py": "print('hi')\n",
+    "a.tmp": "x",
+    "keep.tmp": "x",
+    "build/out.bin": "x",
+    "cache/blob": "x",
+    "sub/.gitignore": "!*.tmp\n",
+    "sub/x.tmp": "x",
+    "sub/Notes.BAK": "x",
+    "key.secret": "x",
+    "shared.secret": "x",
+    "GlobalDir/x.txt": "x",
+    "local-only.txt": "x",
+}
+GLOBAL_IGNORE = "*.secret\nGlobalDir/\n*.bak\n"
+INFO_EXCLUDE = "local-only.txt\n"
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", repo, *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    write(str(home / ".config" / "git" / "ignore"), GLOBAL_IGNORE)
+    write(str(home / ".gitconfig"), "[user]\n\tname = Test\n\temail = test@example.com\n")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    monkeypatch.setenv("GIT_AUTHOR_DATE", "1700000000 +0000")
+    monkeypatch.setenv("GIT_COMMITTER_DATE", "1700000000 +0000")
+    for var in ("XDG_CONFIG_HOME", "GIT_CONFIG_GLOBAL", "GIT_DIR", "GIT_WORK_TREE", "GIT_INDEX_FILE"):
+        monkeypatch.delenv(var, raising=False)
+    return home
+
+
+def make_repo(path, files, ignorecase):
+    for rel, text in files.items():
+        write(os.path.join(path, rel), text)
+    git(path, "init", "-q", "-b", "master")
+    git(path, "config", "core.ignorecase", "true" if ignorecase else "false")
+    write(os.path.join(path, ".git", "info", "exclude"), INFO_EXCLUDE)
+    return path
+
+
+@pytest.mark.parametrize("ignorecase", [False, True])
+def test_same_tree_as_git_add(tmp_path, home, ignorecase):
+    fast = make_repo(str(tmp_path / "fast"), FILES, ignorecase)
+    added = make_repo(str(tmp_path / "added"), FILES, ignorecase)
+
+    assert fast_commit.commit(fast, scan_repo(fast, excludes=()), "master", "Initial commit")
+    git(added, "add", "-A")
+    git(added, "commit", "-q", "-m", "Initial commit")
+
+    assert git(fast, "ls-tree", "-r", "--name-only", "master") == git(added, "ls-tree", "-r", "--name-only", "master")
+    assert git(fast, "rev-parse", "master^{tree}") == git(added, "rev-parse", "master^{tree}")
+
+
+def test_falls_back_when_scan_disagrees_with_git(tmp_path, home):
+    repo = make_repo(str(tmp_path / "repo"), FILES, False)
+    index = scan_repo(repo, excludes=())
+    index.files.pop("main.py")
+    assert not fast_commit.commit(repo, index, "master", "Initial commit")
+    assert subprocess.run(["git", "-C", repo, "rev-parse", "--verify", "-q", "master"]).returncode != 0
+
+
+def test_falls_back_on_case_collisions_with_ignorecase(tmp_path, home):
+    repo = make_repo(str(tmp_path / "repo"), {"README.txt": "a", "readme.txt": "b"}, True)
+    assert not fast_commit.commit(repo, scan_repo(repo, excludes=()), "master", "Initial commit")
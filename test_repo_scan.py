@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# test_repo_scan.py — scan_repo must list exactly what git would add
+#
+#   python -m pytest -q test_repo_scan.py
+#
+# Each case builds a throwaway repo with a throwaway HOME (global config and
+# excludes file) and compares scan_repo against
+# `git ls-files -co --exclude-standard`.
+
+import os, shutil, subprocess
+
+import pytest
+
+from repo_scan import scan_repo
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+FILES = {
+    ".gitignore": "*.tmp\n!keep.tmp\nbuild/\n/rootonly.txt\n!shared.secret\nCache/\n",
+    "main.py": "",
+    "a.tmp": "",
+    "keep.tmp": "",
+    "rootonly.txt": "",
+    "build/out.bin": "",
+    "cache/blob": "",
+    "sub/.gitignore": "!*.tmp\ndocs/*.md\n",
+    "sub/x.tmp": "",
+    "sub/rootonly.txt": "",
+    "sub/build": "",                      # a file: "build/" only ignores directories
+    "sub/docs/a.md": "",
+    "sub/docs/deep/b.md": "",
+    "sub/Notes.BAK": "",
+    "key.secret": "",
+    "shared.secret": "",                  # re-included by the repo over the global file
+    "GlobalDir/x.txt": "",
+    "local-only.txt": "",
+    "sub/LOCAL-ONLY.TXT": "",
+}
+GLOBAL_IGNORE = "*.secret\nGlobalDir/\n*.bak\n"
+INFO_EXCLUDE = "local-only.txt\n"
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", repo, *args], check=True, capture_output=True).stdout
+
+
+def git_files(repo):
+    out = git(repo, "ls-files", "-z", "-co", "--exclude-standard")
+    return {p.decode() for p in out.split(b"\0") if p}
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for var in ("XDG_CONFIG_HOME", "GIT_CONFIG_GLOBAL", "GIT_DIR", "GIT_WORK_TREE"):
+        monkeypatch.delenv(var, raising=False)
+    return home
+
+
+@pytest.mark.parametrize("ignorecase", [False, True])
+@pytest.mark.parametrize("excludes_file", ["default", "config"])
+def test_scan_matches_git(tmp_path, home, ignorecase, excludes_file):
+    repo = str(tmp_path / "repo")
+    for rel, text in FILES.items():
+        write(os.path.join(repo, rel), text)
+    if excludes_file == "default":
+        write(str(home / ".config" / "git" / "ignore"), GLOBAL_IGNORE)
+    else:
+        write(str(home / "global-ignore"), GLOBAL_IGNORE)
+        write(str(home / ".gitconfig"), "[core]\n\texcludesFile = ~/global-ignore\n")
+    git(repo, "init", "-q")
+    git(repo, "config", "core.ignorecase", "true" if ignorecase else "false")
+    write(os.path.join(repo, ".git", "info", "exclude"), INFO_EXCLUDE)
+
+    expected = git_files(repo)
+    assert "main.py" in expected and "key.secret" not in expected  # the fixture exercises the global file
+    assert ("sub/Notes.BAK" in expected) != ignorecase
+    assert set(scan_repo(repo, excludes=()).files) == expected
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# transport.py — pooled keep-alive HTTP sessions shared by all portfolio scripts
+
+from typing import Dict, Optional
+
+from config import (HTTP_POOL_SIZE, HTTP_PER_HOST_LIMIT, HTTP_KEEPALIVE_TIMEOUT,
+                    HTTP_DNS_CACHE_TTL, HTTP2)
+
+
+# =================================================
+# ASYNC (aiohttp) — generate_portfolio_page.py
+# =================================================
+def make_async_session(headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+                       limit: int = HTTP_POOL_SIZE, limit_per_host: int = HTTP_PER_HOST_LIMIT):
+    """
+    One ClientSession for the whole run: connections are reused across
+    requests (no Connection: close / force_close) and DNS lookups are cached,
+    so only the first few requests pay the TCP+TLS handshake.
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout) if timeout else None
+    return aiohttp.ClientSession(connector=connector, timeout=client_timeout, headers=headers)
+
+
+# =================================================
+# SYNC (requests / httpx) — admin + push scripts
+# =================================================
+def make_sync_session(headers: Optional[Dict[str, str]] = None, pool_size: int = HTTP_POOL_SIZE):
+    """
+    Keep-alive session with .get/.post/.put/.patch/.delete.
+    Uses httpx over HTTP/2 when httpx + h2 are installed, else a pooled requests.Session.
+    Both follow redirects (the API answers renamed/transferred repos with a 301).
+    """
+    if HTTP2:
+        try:
+            import httpx, h2  # noqa: F401
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                  keepalive_expiry=HTTP_KEEPALIVE_TIMEOUT)
+            return httpx.Client(http2=True, headers=headers, limits=limits, timeout=30,
+                                follow_redirects=True)
+        except ImportError:
+            pass
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -1,3 +1,27 @@
+// build-manifest.json (written by generate_portfolio_page.py) — per-file ETag,
+// Cache-Control, Content-Type and precompressed variants (.br / .gz)
+const MANIFEST_PATH = "/build-manifest.json";
+let manifestPromise = null;
+
+function loadManifest(env, request) {
+  if (!manifestPromise) {
+    const url = new URL(MANIFEST_PATH, request.url);
+    manifestPromise = env.ASSETS.fetch(new Request(url.toString()))
+      .then(resp => (resp.ok ? resp.json() : {}))
+      .catch(() => ({}));
+  }
+  return manifestPromise;
+}
+
+function pickEncoding(request, entry) {
+  const accept = request.headers.get("Accept-Encoding") || "";
+  const encodings = entry.encodings || {};
+  for (const enc of ["br", "gzip"]) {
+    if (encodings[enc] && accept.includes(enc)) return enc;
+  }
+  return null;
+}
+
 export default {
   async fetch(request, env, ctx) {
     try {
@@ -8,9 +32,45 @@ export default {
         url.pathname += "index.html";
       }
 
-      // Serve from ASSETS binding
-      const asset = await env.ASSETS.fetch(new Request(url.toString(), request));
-      return asset;
+      const manifest = await loadManifest(env, request);
+      const entry = manifest[url.pathname.slice(1)];
+
+      // Not a generated file (CV, etc.) — serve from ASSETS binding as-is
+      if (!entry) {
+        return await env.ASSETS.fetch(new Request(url.toString(), request));
+      }
+
+      const headers = new Headers({
+        "Cache-Control": entry.cache_control,
+        "ETag": entry.etag,
+        "Content-Type": entry.content_type,
+        "Vary": "Accept-Encoding",
+      });
+
+      if (request.headers.get("If-None-Match") === entry.etag) {
+        return new Response(null, { status: 304, headers });
+      }
+
+      // Precompressed variant if the client takes it, else the plain file
+      const encoding = pickEncoding(request, entry);
+      let asset = null;
+      if (encoding) {
+        const variant = new URL(url.toString());
+        variant.pathname += entry.encodings[encoding];
+        asset = await env.ASSETS.fetch(new Request(variant.toString()));
+        if (asset.ok) headers.set("Content-Encoding", encoding);
+        else asset = null;
+      }
+      if (!asset) {
+        asset = await env.ASSETS.fetch(new Request(url.toString()));
+        if (!asset.ok) return asset;
+      }
+
+      return new Response(asset.body, {
+        status: 200,
+        headers,
+        encodeBody: headers.has("Content-Encoding") ? "manual" : "automatic",
+      });
     } catch (err) {
       return new Response("404 Not Found", { status: 404 });
     }